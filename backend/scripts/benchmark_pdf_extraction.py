@@ -0,0 +1,90 @@
+"""Compare PDF extraction engines on a folder of sample PDFs.
+
+Usage (from the backend directory):
+
+    poetry run python -m scripts.benchmark_pdf_extraction path/to/corpus
+
+For every engine, reports throughput (pages/sec) and text quality proxies:
+the share of pages with no text, pages that failed or timed out, average
+characters per page, and the share of extracted tokens that look like words
+(garbled extraction produces runs of symbols and split glyphs).
+"""
+
+import argparse
+import re
+import time
+from pathlib import Path
+
+from pypdf import PdfReader
+
+from src.services.pdf_extraction import ENGINES, extract_pages
+
+WORD_PATTERN = re.compile(r"^[^\W\d_]{2,}[.,;:!?)]?$")
+
+
+def benchmark_engine(engine, corpus, page_timeout, workers):
+    pages = empty = failed = chars = tokens = words = 0
+    start = time.perf_counter()
+    for file_bytes, total_pages in corpus:
+        for result in extract_pages(
+            file_bytes, total_pages, [engine], page_timeout, workers
+        ):
+            pages += 1
+            if result.error:
+                failed += 1
+            elif not result.text.strip():
+                empty += 1
+            chars += len(result.text)
+            page_tokens = result.text.split()
+            tokens += len(page_tokens)
+            words += sum(1 for token in page_tokens if WORD_PATTERN.match(token))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "engine": engine,
+        "pages": pages,
+        "pages/sec": pages / elapsed if elapsed else 0.0,
+        "empty %": 100 * empty / pages if pages else 0.0,
+        "failed %": 100 * failed / pages if pages else 0.0,
+        "chars/page": chars / pages if pages else 0.0,
+        "word %": 100 * words / tokens if tokens else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("corpus", type=Path, help="Directory of PDF files")
+    parser.add_argument(
+        "--engines", nargs="+", default=list(ENGINES), choices=list(ENGINES)
+    )
+    parser.add_argument("--page-timeout", type=float, default=10.0)
+    parser.add_argument("--workers", type=int, default=2)
+    args = parser.parse_args()
+
+    corpus = []
+    for path in sorted(args.corpus.glob("**/*.pdf")):
+        file_bytes = path.read_bytes()
+        try:
+            corpus.append((file_bytes, len(PdfReader(path).pages)))
+        except Exception as e:
+            print(f"Skipping {path}: {e}")
+    if not corpus:
+        parser.error(f"No readable PDFs found in {args.corpus}")
+
+    rows = [
+        benchmark_engine(engine, corpus, args.page_timeout, args.workers)
+        for engine in args.engines
+    ]
+    columns = list(rows[0])
+    print("  ".join(f"{column:>12}" for column in columns))
+    for row in rows:
+        print(
+            "  ".join(
+                f"{value:>12.1f}" if isinstance(value, float) else f"{value:>12}"
+                for value in row.values()
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,9 @@
 from fastapi import APIRouter
 
-from src.api.v1.routes import documents, queries
+from src.api.v1.routes import documents, profiles, queries
 
 api_router = APIRouter()
 
 api_router.include_router(documents.router, prefix="/documents", tags=["documents"])
 api_router.include_router(queries.router, prefix="/queries", tags=["queries"])
+api_router.include_router(profiles.router, prefix="/profiles", tags=["profiles"])
@@ -8,12 +8,15 @@ from fastapi import (
     HTTPException,
     status,
 )
+from fastapi.concurrency import run_in_threadpool
+import hashlib
 from uuid import uuid4
 from typing import List
 from pydantic import BaseModel
 
 
-from src.core.dependencies import get_vectorstore, get_redis_client
+from src.core.dependencies import get_chunk_store, get_redis_client, get_vector_cache
+from src.core.profiling import profile_request
 from src.services.document_loader import process_pdf
 from src.core.config import get_settings
 
@@ -30,6 +33,7 @@ class UploadResponse(BaseModel):
     chat_id: str
     total_chunks: int
     filenames: List[str]
+    boilerplate_tokens_removed: int = 0
 
     class Config:
         model_config = {
@@ -38,6 +42,24 @@ class UploadResponse(BaseModel):
                     "chat_id": "550e8400-e29b-41d4-a716-446655440000",
                     "total_chunks": 42,
                     "filenames": ["document1.pdf", "document2.pdf"],
+                    "boilerplate_tokens_removed": 1280,
+                }
+            }
+        }
+
+
+class ChunkResponse(BaseModel):
+    """Response model for the full content of a source chunk"""
+
+    id: str
+    content: str
+
+    class Config:
+        model_config = {
+            "json_schema_extra": {
+                "example": {
+                    "id": "3f2b8c1e-6d4a-4f0e-9a7b-2c5d1e8f9a0b",
+                    "content": "The study found that...",
                 }
             }
         }
@@ -64,6 +86,7 @@ def get_chat_id(request: Request, response: Response) -> str:
     
     The documents will be:
     * Processed and split into chunks
+    * Stripped of headers, footers and other text repeated on every page
     * Associated with your chat session
     * Added to the vector store for later retrieval
     
@@ -78,6 +101,7 @@ def get_chat_id(request: Request, response: Response) -> str:
                         "chat_id": "550e8400-e29b-41d4-a716-446655440000",
                         "total_chunks": 42,
                         "filenames": ["document1.pdf", "document2.pdf"],
+                        "boilerplate_tokens_removed": 1280,
                     }
                 }
             },
@@ -105,12 +129,15 @@ async def upload_pdf(
         ...,
         description="List of PDF files to upload. Maximum size: 10MB per file.",
     ),
-    vectorstore=Depends(get_vectorstore),
+    chunk_store=Depends(get_chunk_store),
+    vector_cache=Depends(get_vector_cache),
     redis_client=Depends(get_redis_client),
+    profile_id=Depends(profile_request),
 ) -> UploadResponse:
     chat_id = get_chat_id(request, response)
     all_docs = []
     total_chunks = 0
+    tokens_removed = 0
     filenames = []
 
     for file in files:
@@ -121,7 +148,8 @@ async def upload_pdf(
             )
 
         file_bytes = await file.read()
-        docs = process_pdf(file_bytes)
+        docs, removed = process_pdf(file_bytes)
+        tokens_removed += removed
         filenames.append(file.filename)
 
         for doc in docs:
@@ -137,7 +165,8 @@ async def upload_pdf(
             total_chunks += 1
 
     if all_docs:
-        vectorstore.add_documents(all_docs)
+        chunk_store.add_documents(all_docs, chat_id, SESSION_TTL_SECONDS)
+        vector_cache.invalidate(chat_id)
         
     # Store filenames in Redis with the same TTL as the session
     files_key = f"files:{chat_id}"
@@ -145,5 +174,59 @@ async def upload_pdf(
     redis_client.expire(files_key, SESSION_TTL_SECONDS)
 
     return UploadResponse(
-        chat_id=chat_id, total_chunks=total_chunks, filenames=filenames
+        chat_id=chat_id,
+        total_chunks=total_chunks,
+        filenames=filenames,
+        boilerplate_tokens_removed=tokens_removed,
+    )
+
+
+@router.get(
+    "/chunks/{chunk_id}",
+    response_model=ChunkResponse,
+    summary="Fetch the full content of a source chunk",
+    description="""
+    Return the full text of a chunk referenced by an answer's sources.
+
+    Chunk content never changes, so responses carry an `ETag` and may be cached
+    by the client for the lifetime of the session. Send `If-None-Match` to get
+    a `304 Not Modified` instead of the body.
+    """,
+    responses={
+        304: {"description": "Content unchanged since the given ETag"},
+        404: {
+            "description": "Chunk not found in this chat session",
+            "content": {"application/json": {"example": {"detail": "Chunk not found"}}},
+        },
+    },
+)
+async def get_chunk(
+    chunk_id: str,
+    request: Request,
+    response: Response,
+    chunk_store=Depends(get_chunk_store),
+) -> ChunkResponse:
+    chat_id = request.cookies.get(SESSION_COOKIE_NAME)
+    content = (
+        await run_in_threadpool(chunk_store.get_text, chat_id, chunk_id)
+        if chat_id
+        else None
     )
+    if content is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Chunk not found",
+        )
+
+    etag = f'"{hashlib.sha256(content.encode("utf-8")).hexdigest()[:32]}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"private, max-age={SESSION_TTL_SECONDS}",
+        "Vary": "Cookie",
+    }
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    response.headers.update(headers)
+    return ChunkResponse(id=chunk_id, content=content)
@@ -0,0 +1,40 @@
+from fastapi import APIRouter, Depends, HTTPException, Security, status
+from fastapi.responses import PlainTextResponse
+
+from src.core.dependencies import get_redis_client
+from src.core.profiling import profile_key
+from src.core.security import get_api_key
+
+router = APIRouter()
+
+
+@router.get(
+    "/{profile_id}",
+    response_class=PlainTextResponse,
+    summary="Fetch a stored request profile",
+    description="""
+    Return a profile recorded for a request sent with the `X-Profile` header.
+
+    The body uses the collapsed stack format (`frame;frame;frame count`) and can
+    be loaded directly into flamegraph.pl or speedscope.
+    """,
+)
+async def get_profile(
+    profile_id: str,
+    api_key: str = Security(get_api_key),
+    redis_client=Depends(get_redis_client),
+) -> PlainTextResponse:
+    if api_key is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="An API key is required to read profiles",
+        )
+
+    profile = redis_client.get(profile_key(profile_id))
+    if profile is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found",
+        )
+
+    return PlainTextResponse(profile.decode("utf-8"))
@@ -1,10 +1,11 @@
 from fastapi import APIRouter, Request, Response, Depends, HTTPException, status
 from pydantic import BaseModel, Field
 from uuid import uuid4
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
 from src.core.config import get_settings
 from src.core.dependencies import get_redis_client
+from src.core.profiling import profile_request
 from src.services.query_processor import process_query
 
 router = APIRouter()
@@ -44,8 +45,15 @@ class AskRequest(BaseModel):
 class SourceMetadata(BaseModel):
     """Model for source document metadata"""
 
-    content: str = Field(..., description="Content snippet from the source document")
+    id: str = Field(
+        ...,
+        description="Chunk id, use /documents/chunks/{id} to fetch the full content",
+    )
     source: str = Field(..., description="Source document identifier")
+    page: Optional[int] = Field(None, description="Page number in the source document")
+    snippet: str = Field(
+        ..., description="Short excerpt matching the answer's citation of this chunk"
+    )
 
 
 class AskResponse(BaseModel):
@@ -63,8 +71,10 @@ class AskResponse(BaseModel):
                 "answer": "The key findings of the research paper include...",
                 "source": [
                     {
-                        "content": "The study found that...",
+                        "id": "3f2b8c1e-6d4a-4f0e-9a7b-2c5d1e8f9a0b",
                         "source": "research_paper.pdf",
+                        "page": 4,
+                        "snippet": "The study found that...",
                     }
                 ],
                 "chat_id": "550e8400-e29b-41d4-a716-446655440000",
@@ -84,7 +94,8 @@ class AskResponse(BaseModel):
     * Use your chat session to identify relevant documents
     * Process your question using a graph-based approach
     * Generate a concise, contextual response
-    * Include source information for verification
+    * Include source information for verification: a chunk id, page and short
+      snippet per source; fetch full content from /documents/chunks/{id}
     
     Make sure to upload documents first using the /documents/upload endpoint.
     """,
@@ -97,8 +108,10 @@ class AskResponse(BaseModel):
                         "answer": "The key findings of the research paper include...",
                         "source": [
                             {
-                                "content": "The study found that...",
+                                "id": "3f2b8c1e-6d4a-4f0e-9a7b-2c5d1e8f9a0b",
                                 "source": "research_paper.pdf",
+                                "page": 4,
+                                "snippet": "The study found that...",
                             }
                         ],
                         "chat_id": "550e8400-e29b-41d4-a716-446655440000",
@@ -124,17 +137,40 @@ class AskResponse(BaseModel):
                 }
             },
         },
+        503: {
+            "description": "A dependency is failing and the request was rejected",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": "A required service is temporarily unavailable. Please try again later."
+                    }
+                }
+            },
+        },
+        504: {
+            "description": "The request deadline was exceeded",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": "Answering your query took too long. Please try again."
+                    }
+                }
+            },
+        },
     },
 )
 async def ask_question(
     request: Request,
     response: Response,
     payload: AskRequest,
+    profile_id=Depends(profile_request),
 ) -> AskResponse:
     chat_id = get_chat_id(request, response)
 
     try:
         result = await process_query(payload.question, chat_id)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
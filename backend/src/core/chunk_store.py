@@ -0,0 +1,151 @@
+import logging
+import zlib
+from typing import Any, Dict, List, Optional
+from uuid import uuid4
+
+import redis
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+logger = logging.getLogger(__name__)
+
+UPSERT_BATCH_SIZE = 100
+FETCH_BATCH_SIZE = 100
+# Key older vectors stored their text under in metadata (PineconeVectorStore)
+LEGACY_TEXT_KEY = "text"
+
+
+def chunks_key(chat_id: str) -> str:
+    return f"chunks:{chat_id}"
+
+
+class ChunkStore:
+    """Vectors in Pinecone, chunk text in Redis.
+
+    Each vector only carries its chunk id and the fields used for filtering.
+    The text lives zlib-compressed in a per-chat Redis hash keyed by chunk id,
+    so the top-k texts for a query come back in a single ``HMGET``.
+    """
+
+    def __init__(self, index: Any, embeddings: Embeddings, redis_client: redis.Redis):
+        self.index = index
+        self.embeddings = embeddings
+        self.redis_client = redis_client
+
+    def add_documents(
+        self, documents: List[Document], chat_id: str, ttl: int
+    ) -> List[str]:
+        """Embed and index documents, storing their text in the docstore."""
+        ids = [str(uuid4()) for _ in documents]
+        vectors = self.embeddings.embed_documents(
+            [doc.page_content for doc in documents]
+        )
+
+        pipeline = self.redis_client.pipeline()
+        pipeline.hset(
+            chunks_key(chat_id),
+            mapping={
+                chunk_id: zlib.compress(doc.page_content.encode("utf-8"))
+                for chunk_id, doc in zip(ids, documents)
+            },
+        )
+        pipeline.expire(chunks_key(chat_id), ttl)
+        pipeline.execute()
+
+        records = [
+            {"id": chunk_id, "values": vector, "metadata": doc.metadata}
+            for chunk_id, vector, doc in zip(ids, vectors, documents)
+        ]
+        for start in range(0, len(records), UPSERT_BATCH_SIZE):
+            self.index.upsert(vectors=records[start : start + UPSERT_BATCH_SIZE])
+
+        return ids
+
+    def query(
+        self, embedding: List[float], k: int, filter: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """Return the ids, scores and metadata of the nearest vectors."""
+        results = self.index.query(
+            vector=embedding, top_k=k, filter=filter, include_metadata=True
+        )
+        return [
+            {"id": match["id"], "score": match["score"], "metadata": match["metadata"]}
+            for match in results["matches"]
+        ]
+
+    def chunk_ids(self, chat_id: str) -> List[str]:
+        """Return the ids of every chunk stored for a chat."""
+        return [
+            chunk_id.decode("utf-8")
+            for chunk_id in self.redis_client.hkeys(chunks_key(chat_id))
+        ]
+
+    def chunk_count(self, chat_id: str) -> int:
+        return self.redis_client.hlen(chunks_key(chat_id))
+
+    def vector_ids(self, chat_id: str, limit: int) -> List[str]:
+        """Return the ids of up to ``limit`` vectors indexed for a chat.
+
+        Unlike ``chunk_ids`` this includes vectors that predate the Redis
+        docstore and keep their text in metadata.
+        """
+        dimension = self.index.describe_index_stats()["dimension"]
+        # Any non-zero vector works: the filter, not the score, picks the ids
+        probe = [1.0] + [0.0] * (dimension - 1)
+        results = self.index.query(
+            vector=probe, top_k=limit, filter={"chat_id": chat_id}
+        )
+        return [match["id"] for match in results["matches"]]
+
+    def fetch_vectors(self, ids: List[str]) -> List[Dict[str, Any]]:
+        """Fetch stored vector values and metadata by id."""
+        records = []
+        for start in range(0, len(ids), FETCH_BATCH_SIZE):
+            response = self.index.fetch(ids=ids[start : start + FETCH_BATCH_SIZE])
+            records.extend(
+                {"id": vector.id, "values": vector.values, "metadata": vector.metadata}
+                for vector in response.vectors.values()
+            )
+        return records
+
+    def get_text(self, chat_id: str, chunk_id: str) -> Optional[str]:
+        """Return the full text of a single chunk of a chat, if it has one."""
+        compressed = self.redis_client.hget(chunks_key(chat_id), chunk_id)
+        if compressed is not None:
+            return zlib.decompress(compressed).decode("utf-8")
+
+        # Older vectors carry their text in metadata instead of the docstore
+        vector = self.index.fetch(ids=[chunk_id]).vectors.get(chunk_id)
+        if vector is None:
+            return None
+        metadata = vector.metadata or {}
+        # Chunk ids are handed out to clients; never serve another chat's text
+        if metadata.get("chat_id") != chat_id:
+            return None
+        return metadata.get(LEGACY_TEXT_KEY)
+
+    def load_documents(
+        self, chat_id: str, matches: List[Dict[str, Any]]
+    ) -> List[Document]:
+        """Fetch the text for query matches in one round trip."""
+        if not matches:
+            return []
+
+        texts = self.redis_client.hmget(
+            chunks_key(chat_id), [match["id"] for match in matches]
+        )
+
+        documents = []
+        for match, compressed in zip(matches, texts):
+            metadata = dict(match["metadata"])
+            if compressed is not None:
+                text = zlib.decompress(compressed).decode("utf-8")
+            elif LEGACY_TEXT_KEY in metadata:
+                text = metadata.pop(LEGACY_TEXT_KEY)
+            else:
+                logger.warning(f"No stored text for chunk {match['id']}, skipping")
+                continue
+            documents.append(
+                Document(id=match["id"], page_content=text, metadata=metadata)
+            )
+        return documents
@@ -1,6 +1,6 @@
 from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Literal, Optional
 
 from pydantic import Field, SecretStr, validator
 from pydantic_settings import BaseSettings
@@ -25,6 +25,35 @@ class Settings(BaseSettings):
     EMBEDDING_MODEL: str
     CHAT_MODEL: str
 
+    # Embeddings
+    EMBEDDING_PROVIDER: Literal["google", "local", "hashing"] = "google"
+    EMBEDDING_BATCH_SIZE: int = 32
+    EMBEDDING_WORKERS: Optional[int] = None  # Defaults to the number of CPUs
+    HASHING_EMBEDDING_DIMENSION: int = 1024
+    EMBEDDING_DIMENSION: Optional[int] = None  # Google model's size, probed if unset
+
+    # Model routing
+    FAST_CHAT_MODEL: Optional[str] = None  # Cheaper model for routing/short answers
+    ROUTER_MAX_FAST_PROMPT_CHARS: int = 6000  # Conversation, excluding context
+    ROUTER_MAX_FAST_CONTEXT_CHARS: int = 16000  # Retrieved chunk text
+    ROUTER_MAX_FAST_TURNS: int = 6
+    ROUTER_FAILURE_COOLDOWN_SECONDS: int = 60
+    ROUTER_SLOW_LATENCY_RATIO: float = 3.0
+
+    # Deadlines and fault tolerance
+    REQUEST_DEADLINE_SECONDS: float = 30.0
+    REDIS_TIMEOUT_SECONDS: float = 2.0
+    EMBEDDING_TIMEOUT_SECONDS: float = 5.0
+    VECTOR_SEARCH_TIMEOUT_SECONDS: float = 5.0
+    VECTOR_SEARCH_HEDGE_SECONDS: float = 0.5  # Minimum wait before a hedged search
+    LLM_TIMEOUT_SECONDS: float = 20.0
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD: int = 5
+    CIRCUIT_BREAKER_RESET_SECONDS: float = 30.0
+
+    # Per-session vector cache
+    VECTOR_CACHE_MAX_MB: int = 256  # 0 disables the cache
+    VECTOR_CACHE_MAX_CHUNKS: int = 2000  # Larger chats always query Pinecone
+
     # Cache
     UPSTASH_REDIS_URL: str
     UPSTASH_REDIS_TOKEN: SecretStr
@@ -33,11 +62,21 @@ class Settings(BaseSettings):
     # Google AI
     GOOGLE_API_KEY: SecretStr
 
+    # PDF extraction
+    # Engines are tried in order for each page until one yields text
+    PDF_EXTRACTION_ENGINES: tuple[str, ...] = ("pypdf", "pdfminer")
+    PDF_PAGE_TIMEOUT_SECONDS: float = 10.0
+    PDF_EXTRACTION_WORKERS: int = 2
+
     # Storage
     UPLOAD_DIR: Path = Path("uploads")
     MAX_UPLOAD_SIZE: int = 10 * 1024 * 1024  # 10MB
     ALLOWED_EXTENSIONS: tuple[str, ...] = ("pdf",)
 
+    # Profiling
+    PROFILE_SAMPLE_INTERVAL: float = 0.005  # 5ms between stack samples
+    PROFILE_TTL: int = 24 * 60 * 60  # keep stored profiles for a day
+
     @validator("API_PREFIX", pre=True)
     def assemble_api_prefix(cls, v: Optional[str], values: Dict[str, Any]) -> str:
         if isinstance(v, str):
@@ -2,13 +2,15 @@ import time
 from functools import lru_cache
 from typing import AsyncGenerator
 from fastapi import Depends
+from src.core.chunk_store import ChunkStore
 from src.core.config import get_settings, Settings
+from src.core.embeddings import create_embeddings, embedding_dimension
+from src.core.model_router import ModelRouter
+from src.core.vector_cache import SessionVectorCache
 
 
 import redis
 from pinecone import Pinecone, ServerlessSpec
-from langchain_google_genai import GoogleGenerativeAIEmbeddings
-from langchain_pinecone import PineconeVectorStore
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_community.cache import RedisCache
 from langchain.embeddings import CacheBackedEmbeddings
@@ -17,36 +19,60 @@ from langchain_core.globals import set_llm_cache
 
 
 @lru_cache()
-def get_vectorstore(settings: Settings | None = None) -> PineconeVectorStore:
+def get_chunk_store(settings: Settings | None = None) -> ChunkStore:
+    """Get the Pinecone index and Redis docstore used for document chunks."""
     if settings is None:
         settings = get_settings()
 
+    embeddings = create_embeddings(settings)
+
     pc = Pinecone(api_key=settings.PINECONE_API_KEY.get_secret_value())
     existing_indexes = [index_info["name"] for index_info in pc.list_indexes()]
+    # Size the index for whichever embedding provider is configured
+    dimension = embedding_dimension(embeddings, settings)
     if settings.PINECONE_INDEX_NAME not in existing_indexes:
         pc.create_index(
             name=settings.PINECONE_INDEX_NAME,
-            dimension=3072,
+            dimension=dimension,
             metric="cosine",
             spec=ServerlessSpec(cloud="aws", region="us-east-1"),
         )
         while not pc.describe_index(settings.PINECONE_INDEX_NAME).status["ready"]:
             time.sleep(1)
+    else:
+        index_dimension = pc.describe_index(settings.PINECONE_INDEX_NAME).dimension
+        if index_dimension != dimension:
+            raise ValueError(
+                f"Pinecone index '{settings.PINECONE_INDEX_NAME}' has dimension "
+                f"{index_dimension}, but the '{settings.EMBEDDING_PROVIDER}' "
+                f"embedding provider produces {dimension}-dimensional vectors. "
+                "Point PINECONE_INDEX_NAME at an index for this provider."
+            )
     index = pc.Index(settings.PINECONE_INDEX_NAME)
 
-    embeddings = GoogleGenerativeAIEmbeddings(
-        model=settings.EMBEDDING_MODEL,
-        google_api_key=settings.GOOGLE_API_KEY.get_secret_value(),
-    )
-
     redis_client = get_redis_client(settings)
 
-    cached_embedder = CacheBackedEmbeddings.from_bytes_store(
-        embeddings, RedisStore(client=redis_client), namespace=embeddings.model
-    )
+    # Only remote embeddings are worth a Redis round trip; local ones are
+    # cheaper to recompute than to fetch.
+    if settings.EMBEDDING_PROVIDER == "google":
+        embeddings = CacheBackedEmbeddings.from_bytes_store(
+            embeddings, RedisStore(client=redis_client), namespace=embeddings.model
+        )
+
+    return ChunkStore(index, embeddings, redis_client)
+
+
+@lru_cache()
+def get_vector_cache(settings: Settings | None = None) -> SessionVectorCache:
+    """Get the in-process cache of per-chat vectors."""
+    if settings is None:
+        settings = get_settings()
 
-    vector_store = PineconeVectorStore(index, cached_embedder)
-    return vector_store
+    return SessionVectorCache(
+        get_chunk_store(settings),
+        max_bytes=settings.VECTOR_CACHE_MAX_MB * 1024 * 1024,
+        max_chunks=settings.VECTOR_CACHE_MAX_CHUNKS,
+    )
 
 
 @lru_cache()
@@ -65,14 +91,22 @@ def get_redis_client(settings: Settings | None = None) -> redis.Redis:
         port=6379,
         password=settings.UPSTASH_REDIS_TOKEN.get_secret_value(),
         ssl=True,
+        socket_timeout=settings.REDIS_TIMEOUT_SECONDS,
+        socket_connect_timeout=settings.REDIS_TIMEOUT_SECONDS,
     )
 
 
 @lru_cache()
 def get_llm_client(
     settings: Settings | None = None,
+    model: str | None = None,
 ) -> ChatGoogleGenerativeAI:
-    """Initialize Google GenerativeAI client."""
+    """Initialize Google GenerativeAI client.
+
+    Args:
+        settings: Application settings
+        model: Chat model name, defaults to ``CHAT_MODEL``
+    """
     if settings is None:
         settings = get_settings()
 
@@ -81,7 +115,20 @@ def get_llm_client(
     set_llm_cache(RedisCache(redis_client))
 
     llm = ChatGoogleGenerativeAI(
-        model=settings.CHAT_MODEL,
+        model=model or settings.CHAT_MODEL,
         google_api_key=settings.GOOGLE_API_KEY.get_secret_value(),
     )
     return llm
+
+
+@lru_cache()
+def get_model_router(settings: Settings | None = None) -> ModelRouter:
+    """Route chat calls between ``FAST_CHAT_MODEL`` and ``CHAT_MODEL``."""
+    if settings is None:
+        settings = get_settings()
+
+    fast = None
+    if settings.FAST_CHAT_MODEL and settings.FAST_CHAT_MODEL != settings.CHAT_MODEL:
+        fast = get_llm_client(settings, settings.FAST_CHAT_MODEL)
+
+    return ModelRouter(settings, strong=get_llm_client(settings), fast=fast)
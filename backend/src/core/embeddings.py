@@ -0,0 +1,128 @@
+import hashlib
+import math
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+from langchain_core.embeddings import Embeddings
+from langchain_google_genai import GoogleGenerativeAIEmbeddings
+
+from src.core.config import Settings
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+class HashingEmbeddings(Embeddings):
+    """Deterministic feature-hashing embedder.
+
+    Needs no model or network access, which makes it useful for tests and local
+    development. Similarity reflects shared words, not meaning.
+    """
+
+    def __init__(self, dimension: int):
+        self.dimension = dimension
+        self.model = f"hashing-{dimension}"
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        vector = [0.0] * self.dimension
+        for token in TOKEN_PATTERN.findall(text.lower()):
+            digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+            value = int.from_bytes(digest, "little")
+            sign = 1.0 if value & 1 else -1.0
+            vector[(value >> 1) % self.dimension] += sign
+        norm = math.sqrt(sum(x * x for x in vector))
+        if norm == 0:
+            return vector
+        return [x / norm for x in vector]
+
+
+class LocalEmbeddings(Embeddings):
+    """Sentence embeddings computed on the CPU with a quantized ONNX model.
+
+    Documents are split into batches that run concurrently in a thread pool;
+    ONNX Runtime releases the GIL during inference, so throughput scales with
+    the number of cores. Requires the optional ``fastembed`` package.
+    """
+
+    def __init__(self, model: str, batch_size: int, workers: Optional[int] = None):
+        try:
+            from fastembed import TextEmbedding
+        except ImportError as e:
+            raise ImportError(
+                "The local embedding provider requires the `fastembed` package. "
+                "Install it with `poetry install --extras local-embeddings`."
+            ) from e
+
+        self.model = model
+        self.batch_size = batch_size
+        self.dimension: Optional[int] = next(
+            (
+                description["dim"]
+                for description in TextEmbedding.list_supported_models()
+                if description["model"].lower() == model.lower()
+            ),
+            None,
+        )
+        # Each inference call uses one thread; parallelism comes from the pool.
+        self._model = TextEmbedding(model_name=model, threads=1)
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers or os.cpu_count(), thread_name_prefix="embedding"
+        )
+
+    def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        return [
+            vector.tolist()
+            for vector in self._model.embed(texts, batch_size=len(texts))
+        ]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        batches = [
+            texts[i : i + self.batch_size]
+            for i in range(0, len(texts), self.batch_size)
+        ]
+        return [
+            vector
+            for batch in self._executor.map(self._embed_batch, batches)
+            for vector in batch
+        ]
+
+    def embed_query(self, text: str) -> List[float]:
+        return next(iter(self._model.query_embed(text))).tolist()
+
+
+def embedding_dimension(embeddings: Embeddings, settings: Settings) -> int:
+    """Return the vector size of ``embeddings``.
+
+    Uses the size the backend reports or ``EMBEDDING_DIMENSION``, and only
+    embeds a probe text when neither is known.
+    """
+    dimension = getattr(embeddings, "dimension", None) or settings.EMBEDDING_DIMENSION
+    if dimension is None:
+        dimension = len(embeddings.embed_query("dimension probe"))
+    return dimension
+
+
+def create_embeddings(settings: Settings) -> Embeddings:
+    """Build the embedding backend selected by ``EMBEDDING_PROVIDER``.
+
+    Every backend exposes a ``model`` attribute used to namespace cached
+    embeddings, so switching providers never serves stale vectors.
+    """
+    if settings.EMBEDDING_PROVIDER == "hashing":
+        return HashingEmbeddings(settings.HASHING_EMBEDDING_DIMENSION)
+
+    if settings.EMBEDDING_PROVIDER == "local":
+        return LocalEmbeddings(
+            settings.EMBEDDING_MODEL,
+            batch_size=settings.EMBEDDING_BATCH_SIZE,
+            workers=settings.EMBEDDING_WORKERS,
+        )
+
+    return GoogleGenerativeAIEmbeddings(
+        model=settings.EMBEDDING_MODEL,
+        google_api_key=settings.GOOGLE_API_KEY.get_secret_value(),
+    )
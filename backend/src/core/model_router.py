@@ -0,0 +1,197 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+
+from src.core.config import Settings
+from src.core.resilience import (
+    CircuitOpenError,
+    LatencyTracker,
+    get_circuit_breaker,
+    is_deadline_error,
+    run_with_timeout,
+)
+
+logger = logging.getLogger(__name__)
+
+LATENCY_WINDOW = 50  # recent calls per model and node behind the p95
+MIN_LATENCY_SAMPLES = 5  # calls both models need on a node before comparing
+
+
+@dataclass
+class ModelStats:
+    """Observed health of a single chat model.
+
+    Latency is tracked per graph node, since a routing call and a long
+    ``generate`` prompt take very different times on the same model.
+    """
+
+    latency: Dict[str, LatencyTracker] = field(default_factory=dict)
+    unavailable_until: float = 0.0
+    slow_until: Dict[str, float] = field(default_factory=dict)
+
+    def record_success(self, node: str, elapsed: float) -> None:
+        self.latency.setdefault(node, LatencyTracker(LATENCY_WINDOW)).record(elapsed)
+
+    def record_failure(self, cooldown: float) -> None:
+        self.unavailable_until = time.monotonic() + cooldown
+
+    def p95(self, node: str) -> Optional[float]:
+        tracker = self.latency.get(node)
+        if tracker is None or len(tracker) < MIN_LATENCY_SAMPLES:
+            return None
+        return tracker.percentile(95)
+
+    def mark_slow(self, node: str, cooldown: float) -> None:
+        self.slow_until[node] = time.monotonic() + cooldown
+        # Judge the model on fresh calls once the cooldown is over
+        self.latency.pop(node, None)
+
+    def is_available(self, node: str) -> bool:
+        now = time.monotonic()
+        return self.unavailable_until <= now and self.slow_until.get(node, 0.0) <= now
+
+
+class ModelRouter:
+    """Pick a chat model per graph node and question complexity.
+
+    Requests go to the fast model when the work is small (tool routing, short
+    conversations, little retrieved context) and to the strong model otherwise.
+    A model is moved to the back of the queue for a cooldown when it fails,
+    times out, or its recent p95 latency on a node grows past
+    ``ROUTER_SLOW_LATENCY_RATIO`` times the other model's on the same node.
+    Comparing the two models on the same node, rather than against a fixed
+    threshold, keeps the strong model's naturally slower answers from
+    benching it.
+    """
+
+    def __init__(
+        self,
+        settings: Settings,
+        strong: BaseChatModel,
+        fast: Optional[BaseChatModel] = None,
+    ):
+        self.settings = settings
+        self.models: Dict[str, BaseChatModel] = {"strong": strong}
+        if fast is not None:
+            self.models["fast"] = fast
+        self.stats: Dict[str, ModelStats] = {name: ModelStats() for name in self.models}
+        self._lock = threading.Lock()
+
+    def select(
+        self,
+        node: str,
+        messages: Sequence[BaseMessage],
+        context_chars: int = 0,
+    ) -> List[str]:
+        """Return model names in the order they should be tried.
+
+        ``context_chars`` is the size of the retrieved text included in
+        ``messages``; it is budgeted separately from the conversation.
+        """
+        if "fast" not in self.models:
+            return ["strong"]
+
+        prompt_chars = sum(len(str(message.content)) for message in messages)
+        turns = sum(1 for message in messages if message.type == "human")
+
+        if node == "query_or_respond":
+            prefer_fast = turns <= self.settings.ROUTER_MAX_FAST_TURNS
+        else:
+            prefer_fast = (
+                prompt_chars - context_chars
+                <= self.settings.ROUTER_MAX_FAST_PROMPT_CHARS
+                and context_chars <= self.settings.ROUTER_MAX_FAST_CONTEXT_CHARS
+                and turns <= self.settings.ROUTER_MAX_FAST_TURNS
+            )
+
+        preferred = ["fast", "strong"] if prefer_fast else ["strong", "fast"]
+        with self._lock:
+            available = [
+                name for name in preferred if self.stats[name].is_available(node)
+            ]
+        return available + [name for name in preferred if name not in available]
+
+    def invoke(
+        self,
+        node: str,
+        messages: Sequence[BaseMessage],
+        tools: Optional[List[Any]] = None,
+        context_chars: int = 0,
+        deadline: Optional[float] = None,
+    ) -> BaseMessage:
+        """Invoke the best available model, falling back on failure.
+
+        Each attempt is bounded by ``LLM_TIMEOUT_SECONDS`` and the request
+        ``deadline``; a timed-out model is treated like a failed one. Every
+        model has its own circuit breaker, so a model that keeps failing is
+        skipped without waiting, and a request fails fast with
+        ``CircuitOpenError`` once all of them are open.
+        """
+        candidates = self.select(node, messages, context_chars)
+        last_error: Optional[Exception] = None
+
+        for name in candidates:
+            model = self.models[name]
+            if tools:
+                model = model.bind_tools(tools)
+
+            start = time.perf_counter()
+            try:
+                response = get_circuit_breaker(f"llm:{name}").call(
+                    run_with_timeout,
+                    f"llm:{name}",
+                    self.settings.LLM_TIMEOUT_SECONDS,
+                    model.invoke,
+                    messages,
+                    deadline=deadline,
+                )
+            except CircuitOpenError as e:
+                logger.info(f"Skipping model '{name}' in {node}: {str(e)}")
+                last_error = last_error or e
+                continue
+            except Exception as e:
+                if is_deadline_error(e):
+                    # The request ran out of time, not the model
+                    raise
+                with self._lock:
+                    self.stats[name].record_failure(
+                        self.settings.ROUTER_FAILURE_COOLDOWN_SECONDS
+                    )
+                logger.warning(f"Model '{name}' failed in {node}: {str(e)}")
+                last_error = e
+                continue
+
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.stats[name].record_success(node, elapsed)
+                self._demote_slow_models(node)
+            logger.info(f"{node} answered by '{name}' model in {elapsed:.2f}s")
+            return response
+
+        raise last_error
+
+    def _demote_slow_models(self, node: str) -> None:
+        """Put models that are far slower than another on ``node`` on cooldown.
+
+        Must be called with ``_lock`` held.
+        """
+        for name, stats in self.stats.items():
+            p95 = stats.p95(node)
+            if p95 is None:
+                continue
+            for other, other_stats in self.stats.items():
+                other_p95 = other_stats.p95(node)
+                if other == name or other_p95 is None:
+                    continue
+                if p95 > self.settings.ROUTER_SLOW_LATENCY_RATIO * other_p95:
+                    logger.warning(
+                        f"Model '{name}' is slow in {node} (p95 {p95:.2f}s vs "
+                        f"{other_p95:.2f}s for '{other}'), demoting it"
+                    )
+                    stats.mark_slow(node, self.settings.ROUTER_FAILURE_COOLDOWN_SECONDS)
+                    break
@@ -0,0 +1,34 @@
+import contextvars
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+# Thread id of the request being profiled. Thread pools that copy the context
+# (the stage executor, LangChain's executors) carry it to the threads doing the
+# work.
+profile_root: contextvars.ContextVar[Optional[int]] = contextvars.ContextVar(
+    "profile_root", default=None
+)
+
+# Threads currently working for a profiled request, mapped to its thread id
+profiled_threads: Dict[int, int] = {}
+
+
+@contextmanager
+def profiled_thread() -> Iterator[None]:
+    """Attribute the current thread to the profiled request, if there is one."""
+    root = profile_root.get()
+    thread_id = threading.get_ident()
+    if root is None or thread_id == root:
+        yield
+        return
+
+    previous = profiled_threads.get(thread_id)
+    profiled_threads[thread_id] = root
+    try:
+        yield
+    finally:
+        if previous is None:
+            profiled_threads.pop(thread_id, None)
+        else:
+            profiled_threads[thread_id] = previous
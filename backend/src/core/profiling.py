@@ -0,0 +1,122 @@
+import sys
+import threading
+import time
+from collections import Counter
+from typing import AsyncGenerator, Optional
+from uuid import uuid4
+
+from fastapi import HTTPException, Request, Response, status
+
+from src.core.config import get_settings
+from src.core.dependencies import get_redis_client
+from src.core.profile_context import profile_root, profiled_threads
+from src.core.security import API_KEY_HEADER, get_api_key
+
+settings = get_settings()
+
+PROFILE_HEADER_NAME = "X-Profile"
+PROFILE_ID_HEADER_NAME = "X-Profile-Id"
+PROFILE_HEADER_TRUE_VALUES = {"1", "true", "yes", "on"}
+
+
+def profile_key(profile_id: str) -> str:
+    return f"profile:{profile_id}"
+
+
+class SamplingProfiler:
+    """Periodically sample the call stack of a thread and of every worker
+    thread registered as working on its behalf (see ``profiled_thread``).
+
+    Stacks are aggregated in the "collapsed" format used by flamegraph.pl and
+    speedscope: one ``frame;frame;frame count`` line per distinct stack.
+    """
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="request-profiler", daemon=True
+        )
+        self.started_at: float = 0.0
+        self.duration: float = 0.0
+
+    def start(self) -> None:
+        self.started_at = time.perf_counter()
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.duration = time.perf_counter() - self.started_at
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            if self.thread_id in frames:
+                self._sample(frames[self.thread_id])
+            for thread_id, root in list(profiled_threads.items()):
+                if root == self.thread_id and thread_id in frames:
+                    self._sample(frames[thread_id], root="[worker]")
+
+    def _sample(self, frame, root: Optional[str] = None) -> None:
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            module = frame.f_globals.get("__name__", code.co_filename)
+            stack.append(f"{module}:{code.co_name}")
+            frame = frame.f_back
+        if root is not None:
+            stack.append(root)
+        self.samples[";".join(reversed(stack))] += 1
+
+    def collapsed(self) -> str:
+        return "\n".join(
+            f"{stack} {count}" for stack, count in self.samples.most_common()
+        )
+
+
+async def profile_request(
+    request: Request, response: Response
+) -> AsyncGenerator[Optional[str], None]:
+    """Profile this request when the client sends ``X-Profile: 1``.
+
+    Only callers presenting a valid API key may enable profiling. The profile is
+    stored in Redis and its id returned in the ``X-Profile-Id`` response header;
+    without the header this dependency does nothing.
+
+    Note that the sampler follows the thread that handles the request, so on a
+    busy worker concurrent requests sharing the event loop may show up as well.
+    """
+    enabled = request.headers.get(PROFILE_HEADER_NAME, "").strip().lower()
+    if enabled not in PROFILE_HEADER_TRUE_VALUES:
+        yield None
+        return
+
+    # Only requests opting in to profiling need a valid key
+    api_key = await get_api_key(request.headers.get(API_KEY_HEADER.model.name))
+    if api_key is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="An API key is required to enable profiling",
+        )
+
+    profile_id = str(uuid4())
+    response.headers[PROFILE_ID_HEADER_NAME] = profile_id
+
+    thread_id = threading.get_ident()
+    profiler = SamplingProfiler(thread_id, settings.PROFILE_SAMPLE_INTERVAL)
+    token = profile_root.set(thread_id)
+    profiler.start()
+    try:
+        yield profile_id
+    finally:
+        profiler.stop()
+        profile_root.reset(token)
+        redis_client = get_redis_client()
+        redis_client.set(
+            profile_key(profile_id),
+            profiler.collapsed(),
+            ex=settings.PROFILE_TTL,
+        )
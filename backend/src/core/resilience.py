@@ -0,0 +1,255 @@
+import contextvars
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    TimeoutError as FutureTimeoutError,
+    wait,
+)
+from typing import Any, Callable, Deque, Dict, Optional, TypeVar
+
+from src.core.config import get_settings
+from src.core.profile_context import profiled_thread
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix="stage")
+
+
+class StageTimeoutError(Exception):
+    """A dependency call did not finish within its time budget.
+
+    ``deadline_bound`` is set when the budget was cut short by the request
+    deadline rather than the stage's own timeout; such a timeout says nothing
+    about the dependency's health.
+    """
+
+    def __init__(self, stage: str, timeout: float, deadline_bound: bool = False):
+        self.stage = stage
+        self.timeout = timeout
+        self.deadline_bound = deadline_bound
+        super().__init__(f"{stage} timed out after {timeout:.2f}s")
+
+
+class DeadlineExceededError(Exception):
+    """The request deadline passed before a stage could start."""
+
+    def __init__(self, stage: str):
+        self.stage = stage
+        super().__init__(f"Request deadline exceeded before {stage}")
+
+
+class CircuitOpenError(Exception):
+    """A dependency is failing and calls to it are being short-circuited."""
+
+    def __init__(self, name: str):
+        self.name = name
+        super().__init__(f"Circuit for {name} is open")
+
+
+def new_deadline(seconds: Optional[float] = None) -> float:
+    """Return an absolute ``time.monotonic()`` deadline for a new request."""
+    if seconds is None:
+        seconds = get_settings().REQUEST_DEADLINE_SECONDS
+    return time.monotonic() + seconds
+
+
+def time_budget(stage: str, timeout: float, deadline: Optional[float]) -> float:
+    """Seconds a stage may take, bounded by both its timeout and the deadline."""
+    if deadline is None:
+        return timeout
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise DeadlineExceededError(stage)
+    return min(timeout, remaining)
+
+
+def _submit(fn: Callable[..., T], *args: Any, **kwargs: Any) -> "Future[T]":
+    context = contextvars.copy_context()
+
+    def run() -> T:
+        with profiled_thread():
+            return fn(*args, **kwargs)
+
+    return _executor.submit(context.run, run)
+
+
+def run_with_timeout(
+    stage: str,
+    timeout: float,
+    fn: Callable[..., T],
+    *args: Any,
+    deadline: Optional[float] = None,
+    **kwargs: Any,
+) -> T:
+    """Run ``fn`` in the stage pool and give up after the stage's budget.
+
+    The worker cannot be interrupted, so on timeout it keeps running in the
+    background while the caller moves on.
+    """
+    budget = time_budget(stage, timeout, deadline)
+    future = _submit(fn, *args, **kwargs)
+    try:
+        return future.result(timeout=budget)
+    except FutureTimeoutError:
+        raise StageTimeoutError(stage, budget, deadline_bound=budget < timeout)
+
+
+class LatencyTracker:
+    """Rolling window of recent latencies for percentile estimates."""
+
+    def __init__(self, size: int = 200):
+        self._samples: Deque[float] = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def record(self, elapsed: float) -> None:
+        with self._lock:
+            self._samples.append(elapsed)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._samples)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        index = min(len(samples) - 1, int(len(samples) * pct / 100))
+        return samples[index]
+
+
+def hedged_call(
+    stage: str,
+    timeout: float,
+    hedge_after: float,
+    fn: Callable[..., T],
+    *args: Any,
+    deadline: Optional[float] = None,
+    tracker: Optional[LatencyTracker] = None,
+    **kwargs: Any,
+) -> T:
+    """Run ``fn`` and, if it is still pending after ``hedge_after``, start a
+    duplicate call and return whichever finishes first successfully.
+
+    ``hedge_after`` is a floor: once the tracker has samples, the duplicate is
+    only sent when the first call runs past the observed p95.
+    """
+    budget = time_budget(stage, timeout, deadline)
+    if tracker is not None:
+        p95 = tracker.percentile(95)
+        if p95 is not None:
+            hedge_after = max(hedge_after, p95)
+
+    start = time.monotonic()
+    pending = {_submit(fn, *args, **kwargs)}
+    done, pending = wait(pending, timeout=min(hedge_after, budget))
+    if not done and time.monotonic() - start < budget:
+        logger.info(f"Hedging {stage} after {hedge_after:.2f}s")
+        pending.add(_submit(fn, *args, **kwargs))
+
+    last_error: Optional[BaseException] = None
+    while True:
+        for future in done:
+            if future.exception() is None:
+                if tracker is not None:
+                    tracker.record(time.monotonic() - start)
+                return future.result()
+            last_error = future.exception()
+        if not pending:
+            raise last_error
+        remaining = budget - (time.monotonic() - start)
+        if remaining <= 0:
+            raise StageTimeoutError(stage, budget, deadline_bound=budget < timeout)
+        done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+
+
+def is_deadline_error(error: BaseException) -> bool:
+    """Whether ``error`` was caused by the request deadline, not a dependency."""
+    return isinstance(error, DeadlineExceededError) or (
+        isinstance(error, StageTimeoutError) and error.deadline_bound
+    )
+
+
+class CircuitBreaker:
+    """Fail fast while a dependency keeps erroring.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and calls
+    raise ``CircuitOpenError`` immediately. Once ``reset_timeout`` has passed a
+    single trial call is let through; success closes the circuit again.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def call(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        self._before_call()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            if is_deadline_error(e):
+                # Running out of request budget says nothing about the
+                # dependency's health.
+                with self._lock:
+                    self._trial_in_flight = False
+                raise
+            self._record_failure()
+            raise
+        self._record_success()
+        return result
+
+    def _before_call(self) -> None:
+        with self._lock:
+            if self._opened_at is None:
+                return
+            elapsed = time.monotonic() - self._opened_at
+            if elapsed < self.reset_timeout or self._trial_in_flight:
+                raise CircuitOpenError(self.name)
+            self._trial_in_flight = True
+
+    def _record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._opened_at is None and self._failures < self.failure_threshold:
+                return
+            if self._opened_at is None:
+                logger.warning(f"Opening circuit for {self.name}")
+            self._opened_at = time.monotonic()
+
+    def _record_success(self) -> None:
+        with self._lock:
+            if self._opened_at is not None:
+                logger.info(f"Closing circuit for {self.name}")
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(name: str) -> CircuitBreaker:
+    """Return the process-wide circuit breaker for a dependency."""
+    with _breakers_lock:
+        if name not in _breakers:
+            settings = get_settings()
+            _breakers[name] = CircuitBreaker(
+                name,
+                settings.CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+                settings.CIRCUIT_BREAKER_RESET_SECONDS,
+            )
+        return _breakers[name]
@@ -0,0 +1,183 @@
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from src.core.chunk_store import ChunkStore
+
+logger = logging.getLogger(__name__)
+
+# Metadata filters the cache can evaluate locally; anything else goes remote.
+LOCAL_FILTER_KEYS = {"chat_id", "source"}
+# Chats remembered as needing the remote index (see ``_load``)
+MAX_REMOTE_ONLY_CHATS = 10000
+
+
+@dataclass
+class SessionVectors:
+    """All vectors of one chat, normalized for cosine similarity."""
+
+    chunk_count: int
+    ids: List[str]
+    matrix: np.ndarray
+    metadata: List[Dict[str, Any]]
+    sources: np.ndarray
+
+    @property
+    def nbytes(self) -> int:
+        return self.matrix.nbytes
+
+
+class SessionVectorCache:
+    """In-process cache of each chat's vectors for local top-k search.
+
+    The first question in a chat is answered by the remote index while the
+    chat's vectors load in the background; later questions are served from a
+    float32 matrix. Sessions are evicted least recently used once the cache
+    exceeds ``max_bytes``, and chats with more than ``max_chunks`` chunks are
+    never cached. Uploads invalidate the local entry, and the caller passes the
+    chat's chunk count from Redis so uploads handled by other instances are
+    caught too.
+    """
+
+    def __init__(self, chunk_store: ChunkStore, max_bytes: int, max_chunks: int):
+        self.chunk_store = chunk_store
+        self.max_bytes = max_bytes
+        self.max_chunks = max_chunks
+        self._sessions: "OrderedDict[str, SessionVectors]" = OrderedDict()
+        self._loading: set[str] = set()
+        # Chunk count of chats whose index holds vectors missing from Redis
+        self._remote_only: "OrderedDict[str, int]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=2, thread_name_prefix="vector-cache"
+        )
+
+    def supports(self, filter: Dict[str, Any]) -> bool:
+        """Whether searches with ``filter`` can be served locally."""
+        return self.max_bytes > 0 and set(filter) <= LOCAL_FILTER_KEYS
+
+    def search(
+        self,
+        chat_id: str,
+        chunk_count: int,
+        embedding: List[float],
+        k: int,
+        filter: Dict[str, Any],
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Return the top-k matches, or ``None`` when the remote index is needed.
+
+        ``chunk_count`` is the number of chunks Redis holds for the chat; a
+        cached copy with a different count is stale and gets reloaded.
+        """
+        if not self.supports(filter):
+            return None
+        if chunk_count == 0 or chunk_count > self.max_chunks:
+            return None
+
+        with self._lock:
+            if self._remote_only.get(chat_id) == chunk_count:
+                return None
+            session = self._sessions.get(chat_id)
+            if session is not None:
+                self._sessions.move_to_end(chat_id)
+
+        if session is None or session.chunk_count != chunk_count:
+            self._schedule_load(chat_id)
+            return None
+
+        query = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm == 0:
+            return None
+        scores = session.matrix @ (query / norm)
+
+        source = filter.get("source")
+        if source is not None:
+            allowed = source["$in"] if isinstance(source, dict) else [source]
+            scores = np.where(np.isin(session.sources, allowed), scores, -np.inf)
+
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [
+            {
+                "id": session.ids[i],
+                "score": float(scores[i]),
+                "metadata": session.metadata[i],
+            }
+            for i in top
+            if np.isfinite(scores[i])
+        ]
+
+    def invalidate(self, chat_id: str) -> None:
+        with self._lock:
+            self._sessions.pop(chat_id, None)
+            self._remote_only.pop(chat_id, None)
+
+    def _schedule_load(self, chat_id: str) -> None:
+        with self._lock:
+            if chat_id in self._loading:
+                return
+            self._loading.add(chat_id)
+        self._executor.submit(self._load, chat_id)
+
+    def _load(self, chat_id: str) -> None:
+        try:
+            ids = self.chunk_store.chunk_ids(chat_id)
+            if not ids or len(ids) > self.max_chunks:
+                self.invalidate(chat_id)
+                return
+
+            indexed = self.chunk_store.vector_ids(chat_id, self.max_chunks + 1)
+            if len(indexed) > len(ids):
+                # Vectors indexed before chunk text moved to Redis are not in
+                # the chunk hash; a local search would silently miss them
+                with self._lock:
+                    self._sessions.pop(chat_id, None)
+                    self._remote_only[chat_id] = len(ids)
+                    self._remote_only.move_to_end(chat_id)
+                    if len(self._remote_only) > MAX_REMOTE_ONLY_CHATS:
+                        self._remote_only.popitem(last=False)
+                logger.info(
+                    f"Chat {chat_id} has {len(indexed) - len(ids)} vectors without "
+                    "stored text, serving it from the remote index"
+                )
+                return
+
+            records = self.chunk_store.fetch_vectors(ids)
+            if len(records) < len(ids):
+                # Freshly upserted vectors may not be readable yet; retry later
+                return
+            matrix = np.asarray([r["values"] for r in records], dtype=np.float32)
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            matrix /= np.where(norms == 0, 1, norms)
+            metadata = [dict(r["metadata"] or {}) for r in records]
+            session = SessionVectors(
+                chunk_count=len(ids),
+                ids=[r["id"] for r in records],
+                matrix=matrix,
+                metadata=metadata,
+                sources=np.asarray([m.get("source") for m in metadata], dtype=object),
+            )
+
+            with self._lock:
+                self._sessions[chat_id] = session
+                self._sessions.move_to_end(chat_id)
+                self._evict()
+            logger.info(f"Cached {len(session.ids)} vectors for chat {chat_id}")
+        except Exception as e:
+            logger.warning(f"Failed to cache vectors for chat {chat_id}: {str(e)}")
+        finally:
+            with self._lock:
+                self._loading.discard(chat_id)
+
+    def _evict(self) -> None:
+        total = sum(session.nbytes for session in self._sessions.values())
+        while total > self.max_bytes and self._sessions:
+            _, session = self._sessions.popitem(last=False)
+            total -= session.nbytes
@@ -1,20 +1,109 @@
 # services/document_loader.py
+import re
+from collections import Counter
 from io import BytesIO
-from typing import List
+from typing import List, Tuple
 from langchain_community.document_loaders import PyPDFLoader
 from langchain_core.documents import Document
 from pypdf import PdfReader
 import logging
 
+from src.core.config import get_settings
+from src.services.pdf_extraction import extract_pages
+
 logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Boilerplate detection: lines near the top/bottom of a page are headers or
+# footers when they repeat on enough pages; lines elsewhere need to repeat on
+# nearly every page (e.g. disclaimers) and be long enough that they are not
+# ordinary short content such as table labels before they are dropped.
+BOILERPLATE_MIN_PAGES = 3
+BOILERPLATE_EDGE_LINES = 2
+BOILERPLATE_EDGE_RATIO = 0.5
+BOILERPLATE_BODY_RATIO = 0.8
+BOILERPLATE_MIN_BODY_LINE_CHARS = 40
+CHARS_PER_TOKEN = 4  # rough estimate used for reporting savings
+
+
+def _normalize_line(line: str, mask_digits: bool = False) -> str:
+    """Normalize a line so spacing (and optionally numbers) don't hide repeats."""
+    line = re.sub(r"\s+", " ", line.strip().lower())
+    if mask_digits:
+        line = re.sub(r"\d+", "#", line)
+    return line
+
 
-def process_pdf(file_bytes: bytes) -> List[Document]:
+def strip_boilerplate(pages: List[str]) -> Tuple[List[str], List[int]]:
+    """
+    Remove running headers, footers and repeated boilerplate from page texts.
+    Args:
+        pages: Extracted text of every page, in order
+    Returns:
+        The cleaned page texts and the estimated tokens removed from each page
+    """
+    if len(pages) < BOILERPLATE_MIN_PAGES:
+        return pages, [0] * len(pages)
+
+    page_lines = [page.splitlines() for page in pages]
+
+    # Positions of the first and last few non-blank lines on each page
+    edge_positions = []
+    for lines in page_lines:
+        content = [index for index, line in enumerate(lines) if line.strip()]
+        edge_positions.append(
+            set(content[:BOILERPLATE_EDGE_LINES] + content[-BOILERPLATE_EDGE_LINES:])
+        )
+
+    edge_counts: Counter = Counter()
+    body_counts: Counter = Counter()
+    for lines, edges in zip(page_lines, edge_positions):
+        edge_counts.update(
+            {_normalize_line(lines[index], mask_digits=True) for index in edges}
+        )
+        body_counts.update({_normalize_line(line) for line in lines if line.strip()})
+
+    edge_threshold = BOILERPLATE_EDGE_RATIO * len(pages)
+    body_threshold = BOILERPLATE_BODY_RATIO * len(pages)
+
+    cleaned_pages = []
+    tokens_removed = []
+    for lines, edges in zip(page_lines, edge_positions):
+        kept = []
+        removed_chars = 0
+        for index, line in enumerate(lines):
+            if not line.strip():
+                kept.append(line)
+                continue
+            is_header_or_footer = (
+                index in edges
+                and edge_counts[_normalize_line(line, mask_digits=True)]
+                >= edge_threshold
+            )
+            normalized = _normalize_line(line)
+            is_repeated = (
+                len(normalized) >= BOILERPLATE_MIN_BODY_LINE_CHARS
+                and body_counts[normalized] >= body_threshold
+            )
+            if is_header_or_footer or is_repeated:
+                removed_chars += len(line)
+            else:
+                kept.append(line)
+        cleaned_pages.append("\n".join(kept))
+        tokens_removed.append(removed_chars // CHARS_PER_TOKEN)
+
+    return cleaned_pages, tokens_removed
+
+
+def process_pdf(file_bytes: bytes) -> Tuple[List[Document], int]:
     """
     Process a PDF file and return a list of documents.
     Args:
         file_bytes: Raw bytes of the PDF file
     Returns:
-        List of Document objects with text content and metadata
+        List of Document objects with text content and metadata, and the
+        estimated boilerplate tokens removed (including pages dropped because
+        nothing but boilerplate was left on them)
     """
     try:
         # Create a BytesIO object from the file bytes
@@ -30,10 +119,25 @@ def process_pdf(file_bytes: bytes) -> List[Document]:
         # Reset file pointer for the loader
         pdf_file.seek(0)
         
+        # Extract pages in worker processes so a pathological page can only
+        # cost its time budget before falling back to the next engine
+        pages = extract_pages(
+            file_bytes,
+            total_pages,
+            engines=settings.PDF_EXTRACTION_ENGINES,
+            page_timeout=settings.PDF_PAGE_TIMEOUT_SECONDS,
+            workers=settings.PDF_EXTRACTION_WORKERS,
+        )
+        for page_num, page in enumerate(pages, start=1):
+            if page.error:
+                logger.warning(f"Failed to extract page {page_num}: {page.error}")
+
+        # Drop repeated headers, footers and disclaimers before embedding
+        texts, tokens_removed = strip_boilerplate([page.text for page in pages])
+
         # Create documents with proper metadata
         documents = []
-        for page_num, page in enumerate(pdf.pages, start=1):
-            text = page.extract_text()
+        for page_num, text in enumerate(texts, start=1):
             if text.strip():  # Only add pages with content
                 documents.append(
                     Document(
@@ -49,8 +153,11 @@ def process_pdf(file_bytes: bytes) -> List[Document]:
         if not documents:
             raise ValueError("No text content found in the PDF")
 
-        logger.info(f"Successfully processed PDF with {len(documents)} pages")
-        return documents
+        logger.info(
+            f"Successfully processed PDF with {len(documents)} pages, "
+            f"removed ~{sum(tokens_removed)} boilerplate tokens"
+        )
+        return documents, sum(tokens_removed)
 
     except Exception as e:
         logger.error(f"Error processing PDF: {str(e)}", exc_info=True)
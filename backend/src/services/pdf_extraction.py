@@ -0,0 +1,222 @@
+# services/pdf_extraction.py
+import logging
+import multiprocessing
+import time
+from dataclasses import dataclass
+from io import BytesIO, StringIO
+from multiprocessing.connection import Connection, wait
+from typing import Callable, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Forking a multithreaded server can copy locks held by other threads into the
+# child and deadlock it, so workers start from a clean interpreter instead.
+_mp_context = multiprocessing.get_context(
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+# Opens a document and returns a function extracting the text of one page
+EngineFactory = Callable[[bytes], Callable[[int], str]]
+
+
+def _pypdf_engine(file_bytes: bytes) -> Callable[[int], str]:
+    from pypdf import PdfReader
+
+    reader = PdfReader(BytesIO(file_bytes))
+    return lambda page_index: reader.pages[page_index].extract_text()
+
+
+def _pdfminer_engine(file_bytes: bytes) -> Callable[[int], str]:
+    from pdfminer.converter import TextConverter
+    from pdfminer.layout import LAParams
+    from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+    from pdfminer.pdfpage import PDFPage
+
+    # Parse the xref and page tree once; each call only lays out its own page
+    pages = list(PDFPage.get_pages(BytesIO(file_bytes)))
+    resources = PDFResourceManager()
+
+    def extract(page_index: int) -> str:
+        output = StringIO()
+        converter = TextConverter(resources, output, laparams=LAParams())
+        try:
+            PDFPageInterpreter(resources, converter).process_page(pages[page_index])
+        finally:
+            converter.close()
+        return output.getvalue()
+
+    return extract
+
+
+# Extraction engines by name. Each factory opens a document once per worker and
+# returns a function extracting the text of a single page.
+ENGINES: Dict[str, EngineFactory] = {
+    "pypdf": _pypdf_engine,
+    "pdfminer": _pdfminer_engine,
+}
+
+
+@dataclass
+class PageResult:
+    """Outcome of extracting one page."""
+
+    text: str = ""
+    engine: Optional[str] = None
+    error: Optional[str] = None
+    elapsed: float = 0.0
+
+
+def _worker_main(
+    conn: Connection, file_bytes: bytes, factories: Dict[str, EngineFactory]
+) -> None:
+    """Extract pages requested over ``conn`` until told to stop."""
+    extractors: Dict[str, Callable[[int], str]] = {}
+    while True:
+        task = conn.recv()
+        if task is None:
+            return
+        engine, page_index = task
+        try:
+            if engine not in extractors:
+                extractors[engine] = factories[engine](file_bytes)
+            conn.send((page_index, extractors[engine](page_index) or "", None))
+        except Exception as e:
+            conn.send((page_index, "", f"{type(e).__name__}: {e}"))
+
+
+class _Worker:
+    def __init__(self, file_bytes: bytes, factories: Dict[str, EngineFactory]):
+        self.conn, child_conn = _mp_context.Pipe()
+        # Factories travel with the worker: a freshly started interpreter only
+        # sees the engines registered at import time
+        self.process = _mp_context.Process(
+            target=_worker_main, args=(child_conn, file_bytes, factories), daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        self.page_index: Optional[int] = None
+        self.engine: Optional[str] = None
+        self.started_at = 0.0
+
+    def assign(self, engine: str, page_index: int) -> None:
+        self.engine = engine
+        self.page_index = page_index
+        self.started_at = time.monotonic()
+        self.conn.send((engine, page_index))
+
+    def stop(self) -> None:
+        try:
+            self.conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(timeout=1)
+        self.kill()
+
+    def kill(self) -> None:
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+
+def extract_pages(
+    file_bytes: bytes,
+    total_pages: int,
+    engines: Sequence[str],
+    page_timeout: float,
+    workers: int,
+) -> List[PageResult]:
+    """
+    Extract the text of every page in worker processes.
+    Args:
+        file_bytes: Raw bytes of the PDF file
+        total_pages: Number of pages in the PDF
+        engines: Engine names in order of preference; later engines are only
+            used for pages where earlier ones failed, timed out or found no text
+        page_timeout: Seconds a single page may take with one engine before its
+            worker is killed
+        workers: Maximum number of worker processes
+    Returns:
+        One PageResult per page, in page order
+    """
+    unknown = [engine for engine in engines if engine not in ENGINES]
+    if unknown:
+        raise ValueError(f"Unknown PDF extraction engines: {', '.join(unknown)}")
+
+    factories = {engine: ENGINES[engine] for engine in engines}
+    results = [PageResult() for _ in range(total_pages)]
+    # Pages still to extract, with the position of the engine to try next
+    queue = [(page_index, 0) for page_index in range(total_pages)]
+    queue.reverse()
+    pool = [
+        _Worker(file_bytes, factories) for _ in range(max(1, min(workers, total_pages)))
+    ]
+    busy: Dict[Connection, _Worker] = {}
+    attempts: Dict[int, int] = {}
+
+    def schedule(worker: _Worker) -> None:
+        if queue:
+            page_index, engine_pos = queue.pop()
+            attempts[page_index] = engine_pos
+            worker.assign(engines[engine_pos], page_index)
+            busy[worker.conn] = worker
+
+    def finish(
+        page_index: int, text: str, error: Optional[str], elapsed: float
+    ) -> None:
+        engine_pos = attempts.pop(page_index)
+        result = results[page_index]
+        result.elapsed += elapsed
+        if error is None and text.strip():
+            result.text, result.engine, result.error = text, engines[engine_pos], None
+            return
+        result.error = error or result.error
+        if engine_pos + 1 < len(engines):
+            queue.append((page_index, engine_pos + 1))
+
+    def replace(worker: _Worker) -> None:
+        pool.remove(worker)
+        worker.kill()
+        if queue:
+            replacement = _Worker(file_bytes, factories)
+            pool.append(replacement)
+            schedule(replacement)
+
+    try:
+        for worker in pool:
+            schedule(worker)
+
+        while busy:
+            next_deadline = min(w.started_at for w in busy.values()) + page_timeout
+            timeout = max(0.0, next_deadline - time.monotonic())
+            ready = wait(list(busy), timeout=timeout)
+
+            for conn in ready:
+                worker = busy.pop(conn)
+                elapsed = time.monotonic() - worker.started_at
+                try:
+                    page_index, text, error = conn.recv()
+                except (EOFError, OSError):
+                    # The worker died (e.g. crashed in native code)
+                    finish(worker.page_index, "", "worker exited", elapsed)
+                    replace(worker)
+                    continue
+                finish(page_index, text, error, elapsed)
+                schedule(worker)
+
+            now = time.monotonic()
+            for conn, worker in list(busy.items()):
+                if now - worker.started_at < page_timeout:
+                    continue
+                logger.warning(
+                    f"Page {worker.page_index + 1} timed out with {worker.engine} "
+                    f"after {page_timeout:.1f}s"
+                )
+                del busy[conn]
+                finish(worker.page_index, "", "timeout", page_timeout)
+                replace(worker)
+    finally:
+        for worker in pool:
+            worker.stop()
+
+    return results
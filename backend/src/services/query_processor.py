@@ -1,11 +1,13 @@
 from typing_extensions import Annotated, List
 import logging
 from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
+from redis.exceptions import TimeoutError as RedisTimeoutError
 
 from langgraph.graph import MessagesState, StateGraph, END
 from langchain_core.tools import tool
 from langchain_core.documents import Document
-from langchain_core.messages import SystemMessage
+from langchain_core.messages import RemoveMessage, SystemMessage
 from langgraph.prebuilt import ToolNode, tools_condition
 from langgraph.checkpoint.memory import MemorySaver
 from langgraph.store.base import BaseStore
@@ -14,20 +16,89 @@ from langgraph.prebuilt import InjectedStore
 from langgraph.store.memory import InMemoryStore
 from typing import List
 
-from src.core.dependencies import get_llm_client, get_vectorstore, get_redis_client
+from src.core.config import get_settings
+from src.core.dependencies import (
+    get_chunk_store,
+    get_model_router,
+    get_redis_client,
+    get_vector_cache,
+)
+from src.core.profile_context import profiled_thread
+from src.core.resilience import (
+    CircuitOpenError,
+    DeadlineExceededError,
+    LatencyTracker,
+    StageTimeoutError,
+    get_circuit_breaker,
+    hedged_call,
+    new_deadline,
+    run_with_timeout,
+    time_budget,
+)
+from src.services.snippets import build_snippet
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-llm = get_llm_client()
-vector_store = get_vectorstore()
+settings = get_settings()
+model_router = get_model_router()
+chunk_store = get_chunk_store()
+vector_cache = get_vector_cache()
 redis_client = get_redis_client()
 
+vector_search_latency = LatencyTracker()
+
+
+def get_deadline(config: RunnableConfig) -> float | None:
+    """Read the request deadline threaded through the graph config."""
+    return config.get("configurable", {}).get("deadline")
+
 
 class State(MessagesState):
     context: List[Document]
 
 
+def search_documents(
+    query: str, chat_id: str, filter_dict: dict, deadline: float | None
+) -> List[Document]:
+    """Embed the query, find the nearest chunks and load their text."""
+    embedding = get_circuit_breaker("embedding").call(
+        run_with_timeout,
+        "embedding",
+        settings.EMBEDDING_TIMEOUT_SECONDS,
+        chunk_store.embeddings.embed_query,
+        query,
+        deadline=deadline,
+    )
+    # Serve follow-up questions from the local copy of this chat's vectors
+    matches = None
+    if vector_cache.supports(filter_dict):
+        time_budget("redis", settings.REDIS_TIMEOUT_SECONDS, deadline)
+        chunk_count = get_circuit_breaker("redis").call(
+            chunk_store.chunk_count, chat_id
+        )
+        matches = vector_cache.search(
+            chat_id, chunk_count, embedding, k=5, filter=filter_dict
+        )
+    if matches is None:
+        matches = get_circuit_breaker("vector_search").call(
+            hedged_call,
+            "vector_search",
+            settings.VECTOR_SEARCH_TIMEOUT_SECONDS,
+            settings.VECTOR_SEARCH_HEDGE_SECONDS,
+            chunk_store.query,
+            embedding,
+            k=5,
+            filter=filter_dict,
+            deadline=deadline,
+            tracker=vector_search_latency,
+        )
+    time_budget("redis", settings.REDIS_TIMEOUT_SECONDS, deadline)
+    return get_circuit_breaker("redis").call(
+        chunk_store.load_documents, chat_id, matches
+    )
+
+
 @tool(response_format="content_and_artifact")
 def retrieve(
     query: str,
@@ -55,7 +126,12 @@ def retrieve(
             # For multiple files, use $in operator to match any of the files
             filter_dict["source"] = {"$in": filenames}
 
-    retrieved_docs = vector_store.similarity_search(query, k=5, filter=filter_dict)
+    # retrieve runs on a LangChain executor thread; attribute it to the
+    # profiled request so its outbound calls show up in the profile
+    with profiled_thread():
+        retrieved_docs = search_documents(
+            query, chat_id, filter_dict, get_deadline(config)
+        )
     serialized = "\n\n".join(
         (f"Source: {doc.metadata}\n" f"Content: {doc.page_content}")
         for doc in retrieved_docs
@@ -63,26 +139,34 @@ def retrieve(
     return serialized, retrieved_docs
 
 
-def get_available_documents(chat_id: str) -> list[str]:
+def get_available_documents(chat_id: str, deadline: float | None = None) -> list[str]:
     """Get list of available documents for a chat session from Redis."""
+    time_budget("redis", settings.REDIS_TIMEOUT_SECONDS, deadline)
     files_key = f"files:{chat_id}"
-    files = redis_client.smembers(files_key)
+    files = get_circuit_breaker("redis").call(redis_client.smembers, files_key)
     # Decode bytes to strings
     return sorted(file.decode("utf-8") for file in files) if files else []
 
 
-def query_or_respond(state: State):
+def query_or_respond(state: State, config: RunnableConfig):
     """Generate tool call for retrieval or respond."""
-    llm_with_tools = llm.bind_tools([retrieve])
-    response = llm_with_tools.invoke(state["messages"])
+    response = model_router.invoke(
+        "query_or_respond",
+        state["messages"],
+        tools=[retrieve],
+        deadline=get_deadline(config),
+    )
     # MessagesState appends messages to state instead of overwriting
     return {"messages": [response], "context": []}
 
 
-tools = ToolNode([retrieve])
+# Let retrieval timeouts and open circuits reach process_query instead of being
+# turned into tool error messages for the model; process_query rolls the
+# thread back so the unanswered tool call is not left in the checkpoint.
+tools = ToolNode([retrieve], handle_tool_errors=False)
 
 
-def generate(state: State):
+def generate(state: State, config: RunnableConfig):
     """Generate answer."""
     # Get generated ToolMessages
     recent_tool_messages = []
@@ -125,11 +209,17 @@ def generate(state: State):
     ]
     prompt = [SystemMessage(system_message_content)] + conversation_messages
 
-    # Run
-    response = llm.invoke(prompt)
     context = []
     for tool_message in tool_messages:
         context.extend(tool_message.artifact)
+
+    # Run
+    response = model_router.invoke(
+        "generate",
+        prompt,
+        context_chars=len(docs_content),
+        deadline=get_deadline(config),
+    )
     return {"messages": [response], "context": context}
 
 
@@ -158,36 +248,97 @@ def create_query_graph():
 graph = create_query_graph()
 
 
-async def process_query(query: str, chat_id: str):
-    """Process a query using the graph-based approach."""
+def rollback_turn(config: RunnableConfig, previous_ids: set[str]) -> None:
+    """Drop the messages a failed turn added to the chat's checkpoint.
+
+    A turn that fails inside the graph can leave an AI message whose tool calls
+    never got a response, which the model rejects on every later turn.
+    """
     try:
+        messages = graph.get_state(config).values.get("messages", [])
+        added = [message for message in messages if message.id not in previous_ids]
+        if added:
+            graph.update_state(
+                config,
+                {"messages": [RemoveMessage(id=message.id) for message in added]},
+                as_node="generate",
+            )
+    except Exception as e:
+        logger.error(f"Failed to roll back failed turn: {str(e)}")
+
+
+def answer_query(query: str, chat_id: str, deadline: float) -> dict:
+    """Run the graph for one question. Blocks on Redis, Pinecone and the LLM."""
+    # Runs on a threadpool thread; attribute it to the profiled request
+    with profiled_thread():
         config = RunnableConfig(
-            {"configurable": {"chat_id": chat_id, "thread_id": chat_id}}
+            {
+                "configurable": {
+                    "chat_id": chat_id,
+                    "thread_id": chat_id,
+                    "deadline": deadline,
+                }
+            }
         )
 
         # Get available documents from Redis
-        available_docs = get_available_documents(chat_id)
+        available_docs = get_available_documents(chat_id, deadline)
         files_context = (
             "Available documents: " + ", ".join(available_docs)
             if available_docs
             else "No documents available"
         )
 
-        final_step = graph.invoke(
-            {
-                "messages": [{"role": "user", "content": query + "\n" + files_context}],
-                "config": {"thread_id": chat_id},
-            },
-            config=config,
-        )
-
+        previous_ids = {
+            message.id for message in graph.get_state(config).values.get("messages", [])
+        }
+        try:
+            final_step = graph.invoke(
+                {
+                    "messages": [
+                        {"role": "user", "content": query + "\n" + files_context}
+                    ],
+                    "config": {"thread_id": chat_id},
+                },
+                config=config,
+            )
+        except Exception:
+            rollback_turn(config, previous_ids)
+            raise
+
+        answer = final_step["messages"][-1].content
         return {
-            "content": final_step["messages"][-1].content,
+            "content": answer,
             "metadata": [
-                {"content": doc.page_content, "source": doc.metadata["source"]}
-                for doc in final_step.get("context", [])
+                {
+                    "id": doc.id,
+                    "source": doc.metadata["source"],
+                    "page": doc.metadata.get("page"),
+                    "snippet": build_snippet(answer, ref, doc.page_content),
+                }
+                for ref, doc in enumerate(final_step.get("context", []), start=1)
             ],
         }
+
+
+async def process_query(query: str, chat_id: str):
+    """Process a query using the graph-based approach."""
+    try:
+        # Keep the blocking graph off the event loop so concurrent requests on
+        # this worker are not queued behind it
+        return await run_in_threadpool(answer_query, query, chat_id, new_deadline())
+    except (DeadlineExceededError, StageTimeoutError, RedisTimeoutError) as e:
+        logger.warning(f"Query timed out: {str(e)}")
+        raise HTTPException(
+            status_code=504,
+            detail="Answering your query took too long. Please try again.",
+        )
+    except CircuitOpenError as e:
+        logger.warning(f"Query rejected: {str(e)}")
+        raise HTTPException(
+            status_code=503,
+            detail="A required service is temporarily unavailable. Please try again later.",
+        )
     except Exception as e:
         logger.error(f"Error processing query: {str(e)}", exc_info=True)
         raise HTTPException(
@@ -0,0 +1,37 @@
+# services/snippets.py
+import re
+
+SNIPPET_CHARS = 240
+CITATION_CONTEXT_CHARS = 300  # answer text before a citation used to pick a snippet
+WORD_PATTERN = re.compile(r"\w{4,}")
+SENTENCE_PATTERN = re.compile(r"(?<=[.!?])\s+|\n+")
+TAG_PATTERN = re.compile(r"<[^>]+>")
+
+
+def build_snippet(answer: str, ref: int, content: str) -> str:
+    """Pick the sentence of a chunk that best matches where the answer cites it.
+
+    The answer refers to the ``ref``-th chunk with ``<span id='ref'></span>``;
+    the text just before each citation is compared with the chunk's sentences.
+    Chunks that are never cited fall back to their opening sentence.
+    """
+    citation = re.compile(rf"<span id=[\"']?{ref}[\"']?\s*>")
+    cited_words = set()
+    for match in citation.finditer(answer):
+        window = answer[max(0, match.start() - CITATION_CONTEXT_CHARS) : match.start()]
+        cited_words.update(
+            word.lower() for word in WORD_PATTERN.findall(TAG_PATTERN.sub(" ", window))
+        )
+
+    sentences = [s.strip() for s in SENTENCE_PATTERN.split(content) if s.strip()]
+    if not sentences:
+        return ""
+    snippet = max(
+        sentences,
+        key=lambda sentence: len(
+            cited_words & {word.lower() for word in WORD_PATTERN.findall(sentence)}
+        ),
+    )
+    if len(snippet) > SNIPPET_CHARS:
+        snippet = snippet[:SNIPPET_CHARS].rsplit(" ", 1)[0] + "..."
+    return snippet
@@ -0,0 +1,16 @@
+import os
+
+# Settings are validated on import; give the required ones dummy values so
+# modules can be imported without a .env file.
+for name, value in {
+    "SECRET_KEY": "test",
+    "PINECONE_API_KEY": "test",
+    "PINECONE_ENVIRONMENT": "test",
+    "PINECONE_INDEX_NAME": "test",
+    "EMBEDDING_MODEL": "test",
+    "CHAT_MODEL": "test",
+    "UPSTASH_REDIS_URL": "localhost",
+    "UPSTASH_REDIS_TOKEN": "test",
+    "GOOGLE_API_KEY": "test",
+}.items():
+    os.environ.setdefault(name, value)
@@ -0,0 +1,75 @@
+import zlib
+from types import SimpleNamespace
+
+import pytest
+
+from src.core.chunk_store import ChunkStore, chunks_key
+
+
+class FakeRedis:
+    def __init__(self, hashes):
+        self.hashes = hashes
+
+    def hget(self, key, field):
+        return self.hashes.get(key, {}).get(field)
+
+    def hmget(self, key, fields):
+        return [self.hget(key, field) for field in fields]
+
+
+class FakeIndex:
+    def __init__(self, vectors):
+        self.vectors = vectors
+
+    def fetch(self, ids):
+        return SimpleNamespace(
+            vectors={
+                i: SimpleNamespace(id=i, metadata=self.vectors[i])
+                for i in ids
+                if i in self.vectors
+            }
+        )
+
+
+@pytest.fixture
+def chunk_store():
+    redis_client = FakeRedis(
+        {chunks_key("chat"): {"new": zlib.compress("stored text".encode("utf-8"))}}
+    )
+    index = FakeIndex(
+        {
+            "new": {"chat_id": "chat", "source": "a.pdf"},
+            "legacy": {"chat_id": "chat", "source": "a.pdf", "text": "legacy text"},
+            "foreign": {"chat_id": "other", "source": "b.pdf", "text": "secret"},
+        }
+    )
+    return ChunkStore(index, embeddings=None, redis_client=redis_client)
+
+
+def test_get_text_reads_the_docstore(chunk_store):
+    assert chunk_store.get_text("chat", "new") == "stored text"
+
+
+def test_get_text_falls_back_to_legacy_metadata(chunk_store):
+    assert chunk_store.get_text("chat", "legacy") == "legacy text"
+
+
+def test_get_text_never_serves_another_chats_chunk(chunk_store):
+    assert chunk_store.get_text("chat", "foreign") is None
+    assert chunk_store.get_text("chat", "missing") is None
+
+
+def test_load_documents_mixes_docstore_and_legacy_text(chunk_store):
+    matches = [
+        {"id": "new", "score": 0.9, "metadata": {"source": "a.pdf"}},
+        {"id": "legacy", "score": 0.8, "metadata": {"text": "legacy text"}},
+        {"id": "gone", "score": 0.7, "metadata": {"source": "a.pdf"}},
+    ]
+
+    documents = chunk_store.load_documents("chat", matches)
+
+    assert [(doc.id, doc.page_content) for doc in documents] == [
+        ("new", "stored text"),
+        ("legacy", "legacy text"),
+    ]
+    assert "text" not in documents[1].metadata
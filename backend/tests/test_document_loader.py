@@ -0,0 +1,70 @@
+from src.services.document_loader import strip_boilerplate
+
+DISCLAIMER = "Confidential - do not distribute without written permission"
+
+
+BODIES = [
+    "Revenue grew steadily across all regions.",
+    "Operating costs fell after the restructuring.",
+    "The board approved a new dividend policy.",
+    "Headcount remained flat throughout the year.",
+    "Capital spending focused on the new plant.",
+]
+
+
+def make_page(number, body):
+    return "\n".join(
+        ["ACME Corp Annual Report", *body, DISCLAIMER, f"Page {number} of 5"]
+    )
+
+
+def test_strips_running_headers_footers_and_disclaimers():
+    pages = [make_page(n, [BODIES[n - 1]]) for n in range(1, 6)]
+
+    cleaned, tokens_removed = strip_boilerplate(pages)
+
+    assert cleaned == BODIES
+    assert all(removed > 0 for removed in tokens_removed)
+
+
+def test_keeps_short_lines_repeated_in_the_body():
+    pages = [
+        make_page(n, [f"Results for quarter {n}:", "Revenue", f"{n}00", "Notes"])
+        for n in range(1, 6)
+    ]
+
+    cleaned, _ = strip_boilerplate(pages)
+
+    for page in cleaned:
+        assert "Revenue" in page
+        assert "Notes" in page
+        assert DISCLAIMER not in page
+
+
+def test_keeps_lines_repeated_on_few_pages():
+    pages = [make_page(n, ["Unique text for this page " + str(n)]) for n in range(5)]
+    pages[0] += "\n" + "A long quoted sentence that appears on two pages only."
+    pages[1] += "\n" + "A long quoted sentence that appears on two pages only."
+
+    cleaned, _ = strip_boilerplate(pages)
+
+    assert "appears on two pages only" in cleaned[0]
+
+
+def test_reports_tokens_for_pages_left_empty():
+    pages = [make_page(n, [BODIES[n - 1]]) for n in range(1, 5)]
+    pages.append(make_page(5, []))
+
+    cleaned, tokens_removed = strip_boilerplate(pages)
+
+    assert not cleaned[-1].strip()
+    assert tokens_removed[-1] > 0
+
+
+def test_short_documents_are_left_alone():
+    pages = [make_page(1, ["Only page"]), make_page(2, ["Second page"])]
+
+    cleaned, tokens_removed = strip_boilerplate(pages)
+
+    assert cleaned == pages
+    assert tokens_removed == [0, 0]
@@ -0,0 +1,45 @@
+import pytest
+
+from src.core.config import get_settings
+from src.core.embeddings import HashingEmbeddings, embedding_dimension
+
+
+class RemoteEmbeddings:
+    def __init__(self, dimension):
+        self.size = dimension
+        self.calls = 0
+
+    def embed_query(self, text):
+        self.calls += 1
+        return [0.0] * self.size
+
+
+@pytest.fixture
+def settings():
+    return get_settings().model_copy(update={"EMBEDDING_DIMENSION": None})
+
+
+def test_hashing_embeddings_are_unit_length():
+    vector = HashingEmbeddings(64).embed_query("The quick brown fox")
+
+    assert len(vector) == 64
+    assert sum(x * x for x in vector) == pytest.approx(1.0)
+
+
+def test_dimension_reported_by_backend_needs_no_call(settings):
+    assert embedding_dimension(HashingEmbeddings(64), settings) == 64
+
+
+def test_configured_dimension_needs_no_call(settings):
+    embeddings = RemoteEmbeddings(768)
+    settings = settings.model_copy(update={"EMBEDDING_DIMENSION": 768})
+
+    assert embedding_dimension(embeddings, settings) == 768
+    assert embeddings.calls == 0
+
+
+def test_unknown_dimension_is_probed(settings):
+    embeddings = RemoteEmbeddings(3072)
+
+    assert embedding_dimension(embeddings, settings) == 3072
+    assert embeddings.calls == 1
@@ -0,0 +1,173 @@
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+from src.core import model_router, resilience
+from src.core.config import get_settings
+from src.core.model_router import MIN_LATENCY_SAMPLES, ModelRouter
+from src.core.resilience import CircuitOpenError
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class StubModel:
+    def __init__(self, name, clock, latency=1.0):
+        self.name = name
+        self.clock = clock
+        self.latency = latency
+        self.error = None
+        self.calls = 0
+
+    def bind_tools(self, tools):
+        return self
+
+    def invoke(self, messages):
+        self.calls += 1
+        self.clock.now += self.latency
+        if self.error is not None:
+            raise self.error
+        return AIMessage(self.name)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(model_router.time, "perf_counter", clock)
+    monkeypatch.setattr(model_router.time, "monotonic", clock)
+    return clock
+
+
+@pytest.fixture(autouse=True)
+def breakers(monkeypatch):
+    monkeypatch.setattr(resilience, "_breakers", {})
+
+
+@pytest.fixture
+def settings():
+    return get_settings().model_copy(
+        update={
+            "ROUTER_MAX_FAST_PROMPT_CHARS": 1000,
+            "ROUTER_MAX_FAST_CONTEXT_CHARS": 5000,
+            "ROUTER_MAX_FAST_TURNS": 2,
+            "ROUTER_FAILURE_COOLDOWN_SECONDS": 60,
+            "ROUTER_SLOW_LATENCY_RATIO": 3.0,
+        }
+    )
+
+
+@pytest.fixture
+def models(clock):
+    return StubModel("strong", clock, latency=2.5), StubModel("fast", clock)
+
+
+@pytest.fixture
+def router(settings, models):
+    strong, fast = models
+    return ModelRouter(settings, strong, fast)
+
+
+def question(text="What does the report say?", context=""):
+    return [SystemMessage(f"Answer using: {context}"), HumanMessage(text)]
+
+
+def test_uses_strong_model_without_fast_model(settings, models):
+    router = ModelRouter(settings, models[0])
+
+    assert router.select("query_or_respond", question()) == ["strong"]
+
+
+def test_routes_tool_calls_to_fast_model(router):
+    assert router.select("query_or_respond", question()) == ["fast", "strong"]
+
+
+def test_routes_long_conversations_to_strong_model(router):
+    messages = question() + [AIMessage("..."), HumanMessage("?"), HumanMessage("?")]
+
+    assert router.select("query_or_respond", messages) == ["strong", "fast"]
+
+
+def test_retrieved_context_is_budgeted_separately(router):
+    context = "x" * 4000
+    messages = question(context=context)
+
+    assert router.select("generate", messages, context_chars=len(context)) == [
+        "fast",
+        "strong",
+    ]
+    assert router.select("generate", messages) == ["strong", "fast"]
+
+
+def test_routes_large_context_to_strong_model(router):
+    context = "x" * 6000
+
+    assert router.select(
+        "generate", question(context=context), context_chars=len(context)
+    ) == ["strong", "fast"]
+
+
+def test_falls_back_and_cools_down_failed_model(router, models, clock):
+    strong, fast = models
+    fast.error = RuntimeError("unavailable")
+
+    assert router.invoke("query_or_respond", question()).content == "strong"
+    assert router.select("query_or_respond", question()) == ["strong", "fast"]
+
+    clock.now += 61
+    assert router.select("query_or_respond", question()) == ["fast", "strong"]
+
+
+def test_raises_last_error_when_every_model_fails(router, models):
+    for model in models:
+        model.error = RuntimeError(f"{model.name} unavailable")
+
+    with pytest.raises(RuntimeError, match="unavailable"):
+        router.invoke("query_or_respond", question())
+
+
+def test_fails_fast_when_every_circuit_is_open(router, models, settings):
+    for model in models:
+        model.error = RuntimeError("unavailable")
+    for _ in range(settings.CIRCUIT_BREAKER_FAILURE_THRESHOLD):
+        with pytest.raises(RuntimeError):
+            router.invoke("query_or_respond", question())
+    calls = [model.calls for model in models]
+
+    with pytest.raises(CircuitOpenError):
+        router.invoke("query_or_respond", question())
+    assert [model.calls for model in models] == calls
+
+
+def test_demotes_model_much_slower_than_the_other_on_a_node(router, models, clock):
+    strong, fast = models
+    fast.latency = 19.0
+    big_context = "x" * 6000
+    for _ in range(MIN_LATENCY_SAMPLES):
+        router.invoke(
+            "generate", question(context=big_context), context_chars=len(big_context)
+        )
+        router.invoke("generate", question())
+
+    assert router.select("generate", question()) == ["strong", "fast"]
+    # Other nodes are judged separately
+    assert router.select("query_or_respond", question()) == ["fast", "strong"]
+
+    clock.now += 61
+    assert router.select("generate", question()) == ["fast", "strong"]
+
+
+def test_keeps_strong_model_that_is_only_moderately_slower(router, models):
+    big_context = "x" * 6000
+    for _ in range(MIN_LATENCY_SAMPLES):
+        router.invoke(
+            "generate", question(context=big_context), context_chars=len(big_context)
+        )
+        router.invoke("generate", question())
+
+    assert router.select(
+        "generate", question(context=big_context), context_chars=len(big_context)
+    ) == ["strong", "fast"]
@@ -0,0 +1,152 @@
+import os
+import time
+
+import pytest
+
+from src.services import pdf_extraction
+from src.services.pdf_extraction import extract_pages
+
+# Engines run in worker processes, so they must be importable module-level
+# functions rather than closures.
+
+
+def _text_engine(file_bytes):
+    return lambda page_index: f"text of page {page_index + 1}"
+
+
+def _failing_engine(file_bytes):
+    def extract(page_index):
+        raise RuntimeError("cannot parse page")
+
+    return extract
+
+
+def _empty_engine(file_bytes):
+    return lambda page_index: ""
+
+
+def _hanging_engine(file_bytes):
+    def extract(page_index):
+        if page_index == 1:
+            time.sleep(60)
+        return f"hanging engine page {page_index + 1}"
+
+    return extract
+
+
+def _crashing_engine(file_bytes):
+    def extract(page_index):
+        os._exit(1)
+
+    return extract
+
+
+def make_pdf(pages):
+    """Build a minimal PDF with one line of Helvetica text per page."""
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        None,
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    kids = []
+    for text in pages:
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objects.append(
+            "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>"
+        )
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    pdf = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += f"{number} 0 obj\n{body}\nendobj\n".encode()
+    xref = len(pdf)
+    pdf += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    pdf += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode()
+    pdf += (
+        f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\n"
+        f"startxref\n{xref}\n%%EOF\n"
+    ).encode()
+    return bytes(pdf)
+
+
+@pytest.fixture
+def engines(monkeypatch):
+    monkeypatch.setattr(
+        pdf_extraction,
+        "ENGINES",
+        {
+            "text": _text_engine,
+            "failing": _failing_engine,
+            "empty": _empty_engine,
+            "hanging": _hanging_engine,
+            "crashing": _crashing_engine,
+        },
+    )
+
+
+@pytest.mark.usefixtures("engines")
+def test_extracts_every_page_in_order():
+    results = extract_pages(b"", 4, ["text"], page_timeout=5, workers=2)
+
+    assert [r.text for r in results] == [f"text of page {n}" for n in range(1, 5)]
+    assert all(r.engine == "text" and r.error is None for r in results)
+
+
+@pytest.mark.parametrize("first_engine", ["failing", "empty", "crashing"])
+@pytest.mark.usefixtures("engines")
+def test_falls_back_to_next_engine(first_engine):
+    results = extract_pages(b"", 3, [first_engine, "text"], page_timeout=5, workers=2)
+
+    assert [r.engine for r in results] == ["text"] * 3
+    assert [r.text for r in results] == [f"text of page {n}" for n in range(1, 4)]
+
+
+@pytest.mark.usefixtures("engines")
+def test_reports_error_when_every_engine_fails():
+    results = extract_pages(b"", 2, ["failing"], page_timeout=5, workers=1)
+
+    assert all(r.text == "" and r.engine is None for r in results)
+    assert all("cannot parse page" in r.error for r in results)
+
+
+@pytest.mark.usefixtures("engines")
+def test_timed_out_page_falls_back_without_blocking_others():
+    start = time.monotonic()
+    results = extract_pages(b"", 3, ["hanging", "text"], page_timeout=1, workers=2)
+    elapsed = time.monotonic() - start
+
+    assert elapsed < 10
+    assert [r.engine for r in results] == ["hanging", "text", "hanging"]
+    assert results[1].text == "text of page 2"
+    assert results[1].elapsed >= 1
+
+
+@pytest.mark.usefixtures("engines")
+def test_timed_out_page_reports_timeout_without_fallback():
+    results = extract_pages(b"", 2, ["hanging"], page_timeout=0.5, workers=1)
+
+    assert results[0].text == "hanging engine page 1"
+    assert results[1].error == "timeout"
+
+
+@pytest.mark.usefixtures("engines")
+def test_rejects_unknown_engines():
+    with pytest.raises(ValueError):
+        extract_pages(b"", 1, ["nope"], page_timeout=1, workers=1)
+
+
+@pytest.mark.parametrize("engine", ["pypdf", "pdfminer"])
+def test_real_engines_extract_each_page(engine):
+    pdf = make_pdf([f"Text on page {n}" for n in range(1, 4)])
+
+    results = extract_pages(pdf, 3, [engine], page_timeout=30, workers=2)
+
+    assert [r.text.strip() for r in results] == [
+        f"Text on page {n}" for n in range(1, 4)
+    ]
+    assert all(r.engine == engine for r in results)
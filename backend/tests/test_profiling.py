@@ -0,0 +1,104 @@
+import time
+
+import httpx
+import pytest
+from fastapi import Depends, FastAPI
+
+from src.core import profiling
+from src.core.config import get_settings
+from src.core.profiling import (
+    PROFILE_ID_HEADER_NAME,
+    profile_key,
+    profile_request,
+)
+
+
+class FakeRedis:
+    def __init__(self):
+        self.values = {}
+
+    def set(self, key, value, ex=None):
+        self.values[key] = value
+
+
+def busy_handler_work():
+    end = time.perf_counter() + 0.1
+    while time.perf_counter() < end:
+        pass
+
+
+@pytest.fixture
+def redis_client(monkeypatch):
+    client = FakeRedis()
+    monkeypatch.setattr(profiling, "get_redis_client", lambda: client)
+    return client
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(
+        profiling,
+        "settings",
+        get_settings().model_copy(update={"PROFILE_SAMPLE_INTERVAL": 0.001}),
+    )
+    app = FastAPI()
+
+    @app.get("/work")
+    async def work(profile_id=Depends(profile_request)):
+        busy_handler_work()
+        return {"profile_id": profile_id}
+
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    )
+
+
+def api_key():
+    return get_settings().SECRET_KEY.get_secret_value()
+
+
+@pytest.mark.parametrize("headers", [{}, {"X-Profile": "0"}, {"X-Profile": "no"}])
+@pytest.mark.asyncio
+async def test_does_nothing_without_profile_header(client, redis_client, headers):
+    response = await client.get("/work", headers=headers)
+
+    assert response.status_code == 200
+    assert response.json() == {"profile_id": None}
+    assert PROFILE_ID_HEADER_NAME not in response.headers
+    assert redis_client.values == {}
+
+
+@pytest.mark.asyncio
+async def test_ignores_api_key_when_not_profiling(client, redis_client):
+    response = await client.get("/work", headers={"X-API-Key": "wrong"})
+
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize("headers", [{}, {"X-API-Key": "wrong"}])
+@pytest.mark.asyncio
+async def test_requires_valid_api_key(client, redis_client, headers):
+    response = await client.get("/work", headers={"X-Profile": "1", **headers})
+
+    assert response.status_code == 401
+    assert redis_client.values == {}
+
+
+@pytest.mark.asyncio
+async def test_stores_collapsed_stacks(client, redis_client):
+    response = await client.get(
+        "/work", headers={"X-Profile": "true", "X-API-Key": api_key()}
+    )
+
+    assert response.status_code == 200
+    profile_id = response.headers[PROFILE_ID_HEADER_NAME]
+    assert response.json() == {"profile_id": profile_id}
+
+    collapsed = redis_client.values[profile_key(profile_id)]
+    lines = collapsed.splitlines()
+    assert lines
+    for line in lines:
+        stack, count = line.rsplit(" ", 1)
+        assert int(count) > 0
+        assert ";" in stack
+    assert "test_profiling:busy_handler_work" in collapsed
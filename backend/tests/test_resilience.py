@@ -0,0 +1,147 @@
+import threading
+import time
+
+import pytest
+
+from src.core.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    DeadlineExceededError,
+    LatencyTracker,
+    StageTimeoutError,
+    hedged_call,
+    run_with_timeout,
+)
+
+
+def fail():
+    raise ValueError("boom")
+
+
+def test_run_with_timeout_returns_result():
+    assert run_with_timeout("stage", 1.0, lambda x: x * 2, 21) == 42
+
+
+def test_run_with_timeout_raises_stage_timeout():
+    with pytest.raises(StageTimeoutError) as exc_info:
+        run_with_timeout("stage", 0.05, time.sleep, 1)
+    assert exc_info.value.stage == "stage"
+    assert not exc_info.value.deadline_bound
+
+
+def test_run_with_timeout_marks_deadline_bound_timeouts():
+    deadline = time.monotonic() + 0.05
+    with pytest.raises(StageTimeoutError) as exc_info:
+        run_with_timeout("stage", 5.0, time.sleep, 1, deadline=deadline)
+    assert exc_info.value.deadline_bound
+
+
+def test_run_with_timeout_rejects_expired_deadline():
+    with pytest.raises(DeadlineExceededError):
+        run_with_timeout("stage", 1.0, fail, deadline=time.monotonic() - 1)
+
+
+def test_hedged_call_returns_hedge_when_first_call_is_slow():
+    calls = []
+    release = threading.Event()
+
+    def slow_then_fast():
+        calls.append(None)
+        if len(calls) == 1:
+            release.wait(1)
+            return "first"
+        return "hedge"
+
+    try:
+        assert hedged_call("stage", 1.0, 0.05, slow_then_fast) == "hedge"
+    finally:
+        release.set()
+    assert len(calls) == 2
+
+
+def test_hedged_call_waits_for_observed_p95():
+    tracker = LatencyTracker()
+    for _ in range(20):
+        tracker.record(0.3)
+    calls = []
+
+    def moderately_slow():
+        calls.append(None)
+        time.sleep(0.1)
+        return "done"
+
+    assert hedged_call("stage", 1.0, 0.01, moderately_slow, tracker=tracker) == "done"
+    assert len(calls) == 1
+
+
+def test_hedged_call_raises_when_every_attempt_fails():
+    with pytest.raises(ValueError):
+        hedged_call("stage", 1.0, 0.01, fail)
+
+
+def test_hedged_call_times_out():
+    with pytest.raises(StageTimeoutError):
+        hedged_call("stage", 0.1, 0.05, time.sleep, 1)
+
+
+def test_circuit_breaker_opens_after_threshold():
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=60)
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            breaker.call(fail)
+    with pytest.raises(CircuitOpenError):
+        breaker.call(lambda: "unreachable")
+
+
+def test_circuit_breaker_success_resets_failures():
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=60)
+    with pytest.raises(ValueError):
+        breaker.call(fail)
+    assert breaker.call(lambda: "ok") == "ok"
+    with pytest.raises(ValueError):
+        breaker.call(fail)
+    assert breaker.call(lambda: "ok") == "ok"
+
+
+def test_circuit_breaker_half_open_trial():
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=0.05)
+    with pytest.raises(ValueError):
+        breaker.call(fail)
+    time.sleep(0.06)
+    # A failed trial re-opens the circuit for another reset period
+    with pytest.raises(ValueError):
+        breaker.call(fail)
+    with pytest.raises(CircuitOpenError):
+        breaker.call(lambda: "ok")
+    time.sleep(0.06)
+    assert breaker.call(lambda: "ok") == "ok"
+    assert breaker.call(lambda: "ok") == "ok"
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        DeadlineExceededError("stage"),
+        StageTimeoutError("stage", 0.1, deadline_bound=True),
+    ],
+)
+def test_circuit_breaker_ignores_deadline_errors(error):
+    def run_out_of_time():
+        raise error
+
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=60)
+    for _ in range(3):
+        with pytest.raises(type(error)):
+            breaker.call(run_out_of_time)
+    assert breaker.call(lambda: "ok") == "ok"
+
+
+def test_circuit_breaker_counts_stage_timeouts():
+    def time_out():
+        raise StageTimeoutError("stage", 0.1)
+
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=60)
+    with pytest.raises(StageTimeoutError):
+        breaker.call(time_out)
+    with pytest.raises(CircuitOpenError):
+        breaker.call(lambda: "ok")
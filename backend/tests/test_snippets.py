@@ -0,0 +1,52 @@
+from src.services.snippets import SNIPPET_CHARS, build_snippet
+
+CONTENT = (
+    "Pinecone stores the vectors. "
+    "Redis keeps the compressed chunk text for each chat session. "
+    "Sessions expire after one day."
+)
+
+
+def test_picks_sentence_matching_the_citation():
+    answer = (
+        "Chunk text is kept compressed in Redis per chat session <span id='1'></span>."
+    )
+
+    assert build_snippet(answer, 1, CONTENT) == (
+        "Redis keeps the compressed chunk text for each chat session."
+    )
+
+
+def test_uses_text_before_the_matching_reference_only():
+    answer = (
+        "Sessions expire after a day <span id='1'></span>. "
+        "Vectors are stored in Pinecone <span id='2'></span>."
+    )
+
+    assert build_snippet(answer, 1, CONTENT) == "Sessions expire after one day."
+
+
+def test_ignores_citation_markup_when_matching():
+    answer = "<span id='2'></span> stores session text <span id=\"1\"></span>"
+
+    assert build_snippet(answer, 1, CONTENT).startswith("Redis keeps")
+
+
+def test_uncited_chunk_falls_back_to_first_sentence():
+    assert build_snippet("No citations here.", 3, CONTENT) == (
+        "Pinecone stores the vectors."
+    )
+
+
+def test_truncates_long_sentences_on_a_word_boundary():
+    content = " ".join(["word"] * 200)
+
+    snippet = build_snippet("", 1, content)
+
+    assert snippet.endswith("...")
+    assert len(snippet) <= SNIPPET_CHARS + 3
+    assert " ".join(["word"] * 10) in snippet
+
+
+def test_empty_content():
+    assert build_snippet("Anything <span id='1'></span>", 1, "  \n ") == ""
@@ -0,0 +1,176 @@
+import time
+
+import pytest
+
+from src.core.vector_cache import SessionVectorCache
+
+DIMENSION = 4
+
+
+class StubChunkStore:
+    """Chunk ids in "Redis" and vectors in the "index", per chat."""
+
+    def __init__(self):
+        self.chunks = {}
+        self.legacy = {}
+        self.loads = 0
+
+    def add(self, chat_id, chunk_id, vector, source="a.pdf"):
+        self.chunks.setdefault(chat_id, {})[chunk_id] = (vector, source)
+
+    def chunk_count(self, chat_id):
+        return len(self.chunks.get(chat_id, {}))
+
+    def chunk_ids(self, chat_id):
+        self.loads += 1
+        return list(self.chunks.get(chat_id, {}))
+
+    def vector_ids(self, chat_id, limit):
+        ids = list(self.chunks.get(chat_id, {})) + self.legacy.get(chat_id, [])
+        return ids[:limit]
+
+    def fetch_vectors(self, ids):
+        vectors = {
+            chunk_id: entry
+            for chunks in self.chunks.values()
+            for chunk_id, entry in chunks.items()
+        }
+        return [
+            {"id": i, "values": vectors[i][0], "metadata": {"source": vectors[i][1]}}
+            for i in ids
+            if i in vectors
+        ]
+
+
+def unit(index):
+    vector = [0.0] * DIMENSION
+    vector[index] = 1.0
+    return vector
+
+
+def wait_for_loads(cache):
+    deadline = time.monotonic() + 5
+    while cache._loading and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not cache._loading
+
+
+def search(cache, store, chat_id, embedding, k=2, **filter):
+    return cache.search(
+        chat_id,
+        store.chunk_count(chat_id),
+        embedding,
+        k,
+        {"chat_id": chat_id, **filter},
+    )
+
+
+def cached_search(cache, store, chat_id, embedding, k=2, **filter):
+    """Search once to trigger the background load, then search locally."""
+    search(cache, store, chat_id, embedding, k, **filter)
+    wait_for_loads(cache)
+    return search(cache, store, chat_id, embedding, k, **filter)
+
+
+@pytest.fixture
+def store():
+    store = StubChunkStore()
+    store.add("chat", "c0", unit(0), "a.pdf")
+    store.add("chat", "c1", unit(1), "b.pdf")
+    store.add("chat", "c2", [0.9, 0.1, 0.0, 0.0], "b.pdf")
+    return store
+
+
+@pytest.fixture
+def cache(store):
+    return SessionVectorCache(store, max_bytes=1 << 20, max_chunks=100)
+
+
+def test_first_search_goes_remote_then_serves_locally(cache, store):
+    assert search(cache, store, "chat", unit(0)) is None
+    wait_for_loads(cache)
+
+    matches = search(cache, store, "chat", unit(0))
+
+    assert [match["id"] for match in matches] == ["c0", "c2"]
+    assert matches[0]["score"] == pytest.approx(1.0)
+    assert matches[0]["metadata"] == {"source": "a.pdf"}
+
+
+def test_filters_by_source(cache, store):
+    matches = cached_search(cache, store, "chat", unit(0), source="b.pdf")
+    assert [match["id"] for match in matches] == ["c2", "c1"]
+
+    matches = search(cache, store, "chat", unit(0), k=3, source={"$in": ["a.pdf"]})
+    assert [match["id"] for match in matches] == ["c0"]
+
+
+def test_other_filters_go_remote(cache, store):
+    cached_search(cache, store, "chat", unit(0))
+
+    assert not cache.supports({"chat_id": "chat", "page": 1})
+    assert search(cache, store, "chat", unit(0), page=1) is None
+
+
+def test_reloads_when_chunk_count_changes(cache, store):
+    cached_search(cache, store, "chat", unit(0))
+    store.add("chat", "c3", unit(3))
+
+    assert search(cache, store, "chat", unit(3)) is None
+    wait_for_loads(cache)
+    assert search(cache, store, "chat", unit(3))[0]["id"] == "c3"
+
+
+def test_invalidate_drops_cached_vectors(cache, store):
+    cached_search(cache, store, "chat", unit(0))
+    cache.invalidate("chat")
+
+    assert search(cache, store, "chat", unit(0)) is None
+
+
+def test_chats_with_legacy_vectors_stay_remote(cache, store):
+    store.legacy["chat"] = ["legacy-0"]
+
+    assert cached_search(cache, store, "chat", unit(0)) is None
+    loads = store.loads
+    assert search(cache, store, "chat", unit(0)) is None
+    wait_for_loads(cache)
+    assert store.loads == loads
+
+    # New chunks change the count, so the chat is checked again
+    store.add("chat", "c3", unit(3))
+    search(cache, store, "chat", unit(0))
+    wait_for_loads(cache)
+    assert store.loads == loads + 1
+
+
+def test_large_chats_are_never_cached(store):
+    cache = SessionVectorCache(store, max_bytes=1 << 20, max_chunks=2)
+
+    assert cached_search(cache, store, "chat", unit(0)) is None
+    assert store.loads == 0
+
+
+def test_vectors_not_yet_readable_are_retried(cache, store):
+    store.fetch_vectors = lambda ids: []
+
+    assert cached_search(cache, store, "chat", unit(0)) is None
+    assert search(cache, store, "chat", unit(0)) is None
+    wait_for_loads(cache)
+    assert store.loads == 2
+
+
+def test_evicts_least_recently_used_chat(store):
+    store.add("other", "o0", unit(0))
+    store.add("third", "t0", unit(0))
+    # Room for the three-chunk "chat" plus one single-chunk chat
+    cache = SessionVectorCache(store, max_bytes=4 * DIMENSION * 4, max_chunks=100)
+
+    cached_search(cache, store, "chat", unit(0))
+    cached_search(cache, store, "other", unit(0))
+    assert search(cache, store, "chat", unit(0)) is not None  # now most recent
+
+    cached_search(cache, store, "third", unit(0))
+
+    assert search(cache, store, "other", unit(0)) is None
+    assert search(cache, store, "third", unit(0)) is not None
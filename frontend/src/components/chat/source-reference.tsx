@@ -31,9 +31,10 @@ export function SourceReference({ id, source }: SourceReferenceProps) {
           <div className="space-y-2">
             <div className="text-sm font-medium text-zinc-500 dark:text-zinc-400">
               {source.source}
+              {source.page ? `, page ${source.page}` : ""}
             </div>
             <div className="text-sm text-zinc-700 dark:text-zinc-300">
-              {truncateText(source.content)}
+              {truncateText(source.snippet)}
             </div>
           </div>
           <HoverCard.Arrow className="fill-white dark:fill-zinc-900" />
@@ -1,6 +1,8 @@
 export interface Source {
-  content: string;
+  id: string;
   source: string;
+  page?: number | null;
+  snippet: string;
 }
 
 export interface Message {